@@ -1,14 +1,35 @@
 from enum import Enum
 
+# (class name, value) -> the first member made with that key.
+# A module imported from two different locations makes two copies of each enum class;
+# members of both copies share one entry here, so they compare and hash the same.
+_CANONICAL: dict = {}
+
+
 class BaseEnum(Enum):
 
+    def __init__(self, *args) -> None:
+        key = (self.__class__.__name__, self._value_)
+        self._canonical = _CANONICAL.setdefault(key, self)
+        self._hash = hash(key)
+
     def __eq__(self, __value: object) -> bool:
         """
         Python, being an interpreted language,
         has issues when classes are imported from two different locations
 
-        As such we define equality to work on a string comparison instead.
+        As such we define equality on the (class name, value) pair instead, through the canonical member of that pair.
+        Comparing a member with itself (by far the most common case) is a single identity check.
         """
-        if self.__class__.__name__ == __value.__class__.__name__:
-            return self.value == __value.value
-        return False
+        if self is __value:
+            return True
+        return self._canonical is getattr(__value, "_canonical", None)
+
+    def __hash__(self) -> int:
+        """Hash of (class name, value), the same for equal members of both copies of a class."""
+        return self._hash
+
+    @property
+    def canonical(self) -> "BaseEnum":
+        """The member every member equal to this one shares (this one, unless its class was imported twice)."""
+        return self._canonical
@@ -0,0 +1,60 @@
+"""
+Memory benchmark for MonsterBase instances.
+
+Compares the footprint of N monsters using the __slots__ layout of MonsterBase
+against the same monster state kept in a per-instance __dict__ (the layout MonsterBase had before __slots__).
+
+Usage (from the repository root):
+    python -m benchmarks.bench_monster_memory          # 1,000,000 instances
+    python -m benchmarks.bench_monster_memory 100000
+"""
+__docformat__ = 'reStructuredText'
+
+import argparse
+import gc
+import tracemalloc
+
+from helpers import Flamikin
+
+
+class DictMonster:
+    """Instance state MonsterBase had before __slots__, stored in a __dict__."""
+
+    def __init__(self, simple_mode=True, level: int = 1) -> None:
+        self.__simple_mode = simple_mode
+        self.__init_level = level
+        self.__current_level = level
+        self.__max_hp = 6
+        self.__defense = 3
+        self.__dmg = 3
+        self.__speed = 2
+        self.__current_hp = 6
+        self.__is_alive = True
+        self.__eff_dmg = None
+
+
+def measure(make, n: int) -> float:
+    """
+    Returns the bytes per instance (including its slot in the list holding it) to keep n instances alive.
+    :complexity: O(n)
+    """
+    gc.collect()
+    tracemalloc.start()
+    instances = [make() for _ in range(n)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del instances
+    return size / n
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("n", help="Number of instances to create.", type=int, nargs="?", default=1_000_000)
+    args = p.parse_args()
+
+    before = measure(DictMonster, args.n)
+    after = measure(Flamikin, args.n)
+    print(f"{args.n} instances")
+    print(f"__dict__ layout (before): {before:7.1f} B/instance, {before * args.n / 2**20:8.1f} MiB")
+    print(f"__slots__ layout (after): {after:7.1f} B/instance, {after * args.n / 2**20:8.1f} MiB")
+    print(f"saved {100 * (1 - after / before):.0f}% per instance")
@@ -0,0 +1,82 @@
+"""
+Scaling benchmark for MonsterTeam operations.
+
+Builds teams of n monsters (capacity n, so the storage grows past TEAM_LIMIT) in every TeamMode
+and times, per operation:
+    retrieve_from_team  taking every monster out
+    add_to_team         putting them all back
+    special             one call on the full team
+    regenerate_team     one call (n fresh monsters from the creation snapshot)
+
+Usage (from the repository root):
+    python -m benchmarks.bench_team_scaling                  # n = 6, 100, 1000, 10000, 100000
+    python -m benchmarks.bench_team_scaling 6 1000 --repeat 5
+"""
+__docformat__ = 'reStructuredText'
+
+import argparse
+import time
+
+from helpers import get_registry
+from team import MonsterTeam
+
+DEFAULT_SIZES = (6, 100, 1_000, 10_000, 100_000)
+
+
+def make_team(team_mode: MonsterTeam.TeamMode, n: int) -> MonsterTeam:
+    """
+    A team of n spawnable monsters (cycling through the roster) with room for exactly n.
+    :complexity: O(n log n)
+    """
+    spawnable = get_registry().spawnable
+    names = [spawnable[i % len(spawnable)].get_name() for i in range(n)]
+    return MonsterTeam(
+        team_mode,
+        MonsterTeam.SelectionMode.SCRIPTED,
+        script=names,
+        sort_key=MonsterTeam.SortMode.HP,
+        capacity=n,
+    )
+
+
+def time_team(team: MonsterTeam, repeat: int) -> dict[str, float]:
+    """
+    Best of repeat runs of each operation, in seconds per operation.
+    :complexity: O(repeat * n log n)
+    """
+    n = len(team)
+    best = {"retrieve_from_team": float("inf"), "add_to_team": float("inf"), "special": float("inf"), "regenerate_team": float("inf")}
+    for _ in range(repeat):
+        start = time.perf_counter()
+        monsters = [team.retrieve_from_team() for _ in range(n)]
+        best["retrieve_from_team"] = min(best["retrieve_from_team"], (time.perf_counter() - start) / n)
+
+        start = time.perf_counter()
+        for monster in monsters:
+            team.add_to_team(monster)
+        best["add_to_team"] = min(best["add_to_team"], (time.perf_counter() - start) / n)
+
+        start = time.perf_counter()
+        team.special()
+        best["special"] = min(best["special"], time.perf_counter() - start)
+
+        start = time.perf_counter()
+        team.regenerate_team()
+        best["regenerate_team"] = min(best["regenerate_team"], time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("sizes", help="Team sizes to measure.", type=int, nargs="*", default=DEFAULT_SIZES)
+    p.add_argument("--repeat", help="Runs per size, the best is kept.", type=int, default=3)
+    args = p.parse_args()
+
+    print(f"{'mode':<9} {'n':>7} {'retrieve us/op':>15} {'add us/op':>10} {'special us':>11} {'regenerate ms':>14}")
+    for team_mode in (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK, MonsterTeam.TeamMode.OPTIMISE):
+        for n in args.sizes:
+            result = time_team(make_team(team_mode, n), args.repeat)
+            print(
+                f"{team_mode.name:<9} {n:>7} {result['retrieve_from_team'] * 1e6:>15.2f} {result['add_to_team'] * 1e6:>10.2f}"
+                f" {result['special'] * 1e6:>11.1f} {result['regenerate_team'] * 1e3:>14.2f}"
+            )
@@ -0,0 +1,398 @@
+"""
+    Array-based heaps of ListItems, ordered by key:
+    ArrayMaxHeap (the item with the largest key is at the root),
+    ArrayMinMaxHeap (both the smallest and the largest key can be taken, a double ended priority queue)
+    and IndexedMinMaxHeap (a min-max heap that can also change the key of, or remove, any item).
+"""
+from __future__ import annotations
+
+from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import ListItem
+
+__author__ = 'Maria Garcia de la Banda and Brendon Taylor for the ArrayMaxHeap base, XXXXX student for the min-max heaps'
+__docformat__ = 'reStructuredText'
+
+class ArrayMaxHeap:
+    """ Max heap of ListItems implemented with arrays.
+
+    Attributes:
+         length (int): number of elements in the heap
+         array (ArrayR[ListItem]): array storing the elements, the root is at index 1 (index 0 is unused)
+
+    ArrayR cannot create empty arrays. So MIN_CAPACITY used to avoid this.
+    """
+    MIN_CAPACITY = 1
+
+    def __init__(self, max_capacity: int) -> None:
+        """ Initialises the length and the array with the given capacity. """
+        self.length = 0
+        self.array: ArrayR[ListItem] = ArrayR(max(self.MIN_CAPACITY, max_capacity) + 1)
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the heap. """
+        return self.length
+
+    def __str__(self) -> str:
+        """ Elements in array order (not sorted). """
+        result = '['
+        for i in range(1, self.length + 1):
+            if i > 1:
+                result += ', '
+            result += str(self.array[i])
+        result += ']'
+        return result
+
+    def is_empty(self) -> bool:
+        """ True if the heap is empty. """
+        return self.length == 0
+
+    def is_full(self) -> bool:
+        """ True if the heap has no room left without resizing. """
+        return self.length + 1 >= len(self.array)
+
+    def clear(self) -> None:
+        """ Clears all elements from the heap. """
+        self.length = 0
+
+    def _resize(self) -> None:
+        """ Doubles the capacity of the heap. """
+        new_array = ArrayR(2 * len(self.array))
+        for i in range(1, self.length + 1):
+            new_array[i] = self.array[i]
+        self.array = new_array
+
+    def _rise(self, k: int) -> None:
+        """ Moves the element at k up until its parent's key is not smaller.
+        :complexity: O(log n)
+        """
+        item = self.array[k]
+        while k > 1 and self.array[k // 2].key < item.key:
+            self.array[k] = self.array[k // 2]
+            k = k // 2
+        self.array[k] = item
+
+    def _largest_child(self, k: int) -> int:
+        """ Index of the child of k with the largest key.
+        :pre: k has at least one child
+        """
+        if 2 * k == self.length or self.array[2 * k].key > self.array[2 * k + 1].key:
+            return 2 * k
+        return 2 * k + 1
+
+    def _sink(self, k: int) -> None:
+        """ Moves the element at k down until no child has a larger key.
+        :complexity: O(log n)
+        """
+        item = self.array[k]
+        while 2 * k <= self.length:
+            max_child = self._largest_child(k)
+            if self.array[max_child].key <= item.key:
+                break
+            self.array[k] = self.array[max_child]
+            k = max_child
+        self.array[k] = item
+
+    def add(self, item: ListItem) -> None:
+        """ Adds an element to the heap, resizing if needed.
+        :complexity: O(log n)
+        """
+        if self.is_full():
+            self._resize()
+        self.length += 1
+        self.array[self.length] = item
+        self._rise(self.length)
+
+    def peek_max(self) -> ListItem:
+        """ Returns the element with the largest key, without removing it.
+        :raises IndexError: if the heap is empty
+        """
+        if self.is_empty():
+            raise IndexError("Heap is empty")
+        return self.array[1]
+
+    def get_max(self) -> ListItem:
+        """ Removes and returns the element with the largest key.
+        :complexity: O(log n)
+        :raises IndexError: if the heap is empty
+        """
+        if self.is_empty():
+            raise IndexError("Heap is empty")
+        max_item = self.array[1]
+        self.array[1] = self.array[self.length]
+        self.length -= 1
+        if self.length > 0:
+            self._sink(1)
+        return max_item
+
+    def heapify(self) -> None:
+        """ Restores the heap order after keys were changed in place (e.g. all negated).
+        :complexity: O(n)
+        """
+        for k in range(self.length // 2, 0, -1):
+            self._sink(k)
+
+
+class ArrayMinMaxHeap:
+    """ Min-max heap of ListItems implemented with arrays: a double ended priority queue.
+
+    Both the element with the smallest key and the one with the largest key can be
+    looked at in O(1) and removed in O(log n), so a user can take from either end.
+
+    Nodes on even depths (the root is depth 0) have the smallest key of their subtree,
+    nodes on odd depths have the largest key of their subtree.
+
+    Attributes:
+         length (int): number of elements in the heap
+         array (ArrayR[ListItem]): array storing the elements, the root is at index 1 (index 0 is unused)
+
+    ArrayR cannot create empty arrays. So MIN_CAPACITY used to avoid this.
+    """
+    MIN_CAPACITY = 1
+
+    def __init__(self, max_capacity: int) -> None:
+        """ Initialises the length and the array with the given capacity. """
+        self.length = 0
+        self.array: ArrayR[ListItem] = ArrayR(max(self.MIN_CAPACITY, max_capacity) + 1)
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the heap. """
+        return self.length
+
+    def __str__(self) -> str:
+        """ Elements in array order (not sorted). """
+        result = '['
+        for i in range(1, self.length + 1):
+            if i > 1:
+                result += ', '
+            result += str(self.array[i])
+        result += ']'
+        return result
+
+    def is_empty(self) -> bool:
+        """ True if the heap is empty. """
+        return self.length == 0
+
+    def is_full(self) -> bool:
+        """ True if the heap has no room left without resizing. """
+        return self.length + 1 >= len(self.array)
+
+    def clear(self) -> None:
+        """ Clears all elements from the heap. """
+        self.length = 0
+
+    def _resize(self) -> None:
+        """ Doubles the capacity of the heap. """
+        new_array = ArrayR(2 * len(self.array))
+        for i in range(1, self.length + 1):
+            new_array[i] = self.array[i]
+        self.array = new_array
+
+    @staticmethod
+    def _on_min_level(k: int) -> bool:
+        """ True if index k is on an even depth (the root is depth 0). """
+        return (k.bit_length() - 1) % 2 == 0
+
+    def _swap(self, i: int, j: int) -> None:
+        """ Swaps the elements at indices i and j. """
+        self.array[i], self.array[j] = self.array[j], self.array[i]
+
+    def _before(self, i: int, j: int, on_min_level: bool) -> bool:
+        """ True if the element at i belongs above the element at j on this kind of level. """
+        if on_min_level:
+            return self.array[i].key < self.array[j].key
+        return self.array[i].key > self.array[j].key
+
+    def _rise(self, k: int) -> None:
+        """ Moves the element at k up to its place.
+        :complexity: O(log n)
+        """
+        if k == 1:
+            return
+        on_min_level = self._on_min_level(k)
+        parent = k // 2
+        if self._before(parent, k, on_min_level): # the parent is on the other kind of level, so belongs below
+            self._swap(k, parent)
+            k = parent
+            on_min_level = not on_min_level
+        while k > 3 and self._before(k, k // 4, on_min_level): # then move through grandparents on the same kind of level
+            self._swap(k, k // 4)
+            k = k // 4
+
+    def _sink(self, k: int) -> int:
+        """ Moves the element at k down to its place and returns the index it ends up at.
+        :complexity: O(log n)
+        """
+        on_min_level = self._on_min_level(k)
+        placed = None # where the element was left once it was swapped aside, the parent it displaces carries on sinking
+        while 2 * k <= self.length:
+            # the child or grandchild that belongs highest
+            best = 2 * k
+            last = min(4 * k + 3, self.length)
+            for candidate in (2 * k + 1, 4 * k, 4 * k + 1, 4 * k + 2, 4 * k + 3):
+                if candidate <= last and self._before(candidate, best, on_min_level):
+                    best = candidate
+
+            if not self._before(best, k, on_min_level):
+                break
+            self._swap(best, k)
+            if best < 4 * k: # a child, which is a leaf of this subtree
+                k = best
+                break
+            if self._before(best // 2, best, on_min_level): # the grandchild's parent is on the other kind of level
+                self._swap(best, best // 2)
+                if placed is None:
+                    placed = best // 2
+            k = best
+        return k if placed is None else placed
+
+    def copy(self) -> ArrayMinMaxHeap:
+        """ Returns a new heap with the same elements in the same places (the ListItems themselves are shared).
+        :complexity: O(n)
+        """
+        new_heap = ArrayMinMaxHeap(max(self.length, 1))
+        for i in range(1, self.length + 1):
+            new_heap.array[i] = self.array[i]
+        new_heap.length = self.length
+        return new_heap
+
+    def _largest_index(self) -> int:
+        """ Index of the element with the largest key. """
+        if self.length == 1:
+            return 1
+        if self.length == 2 or self.array[2].key >= self.array[3].key:
+            return 2
+        return 3
+
+    def _delete_at(self, k: int) -> ListItem:
+        """ Removes and returns the element at index k.
+        :complexity: O(log n)
+        """
+        item = self.array[k]
+        self.array[k] = self.array[self.length]
+        self.array[self.length] = None
+        self.length -= 1
+        if k <= self.length:
+            self._rise(self._sink(k)) # the moved element can belong below k or above it, rise from wherever sinking left it
+        return item
+
+    def add(self, item: ListItem) -> None:
+        """ Adds an element to the heap, resizing if needed.
+        :complexity: O(log n)
+        """
+        if self.is_full():
+            self._resize()
+        self.length += 1
+        self.array[self.length] = item
+        self._rise(self.length)
+
+    def peek_min(self) -> ListItem:
+        """ Returns the element with the smallest key, without removing it.
+        :raises IndexError: if the heap is empty
+        """
+        if self.is_empty():
+            raise IndexError("Heap is empty")
+        return self.array[1]
+
+    def peek_max(self) -> ListItem:
+        """ Returns the element with the largest key, without removing it.
+        :raises IndexError: if the heap is empty
+        """
+        if self.is_empty():
+            raise IndexError("Heap is empty")
+        return self.array[self._largest_index()]
+
+    def get_min(self) -> ListItem:
+        """ Removes and returns the element with the smallest key.
+        :complexity: O(log n)
+        :raises IndexError: if the heap is empty
+        """
+        if self.is_empty():
+            raise IndexError("Heap is empty")
+        return self._delete_at(1)
+
+    def get_max(self) -> ListItem:
+        """ Removes and returns the element with the largest key.
+        :complexity: O(log n)
+        :raises IndexError: if the heap is empty
+        """
+        if self.is_empty():
+            raise IndexError("Heap is empty")
+        return self._delete_at(self._largest_index())
+
+
+class IndexedMinMaxHeap(ArrayMinMaxHeap):
+    """ Min-max heap that also knows where each value is, so the key of any element can be changed,
+    or the element removed, in O(log n) without searching for it.
+
+    Values must be hashable and each value can only be in the heap once.
+
+    Attributes:
+         positions (dict): value -> index of its ListItem in array
+    """
+
+    def __init__(self, max_capacity: int) -> None:
+        """ Initialises an empty heap with the given capacity. """
+        super().__init__(max_capacity)
+        self.positions = {}
+
+    def __contains__(self, value) -> bool:
+        """ True if value is in the heap. """
+        return value in self.positions
+
+    def clear(self) -> None:
+        """ Clears all elements from the heap. """
+        super().clear()
+        self.positions = {}
+
+    def _swap(self, i: int, j: int) -> None:
+        """ Swaps the elements at indices i and j, keeping track of where they went. """
+        self.array[i], self.array[j] = self.array[j], self.array[i]
+        self.positions[self.array[i].value] = i
+        self.positions[self.array[j].value] = j
+
+    def _delete_at(self, k: int) -> ListItem:
+        """ Removes and returns the element at index k.
+        :complexity: O(log n)
+        """
+        item = self.array[k]
+        del self.positions[item.value]
+        self.array[k] = self.array[self.length]
+        self.array[self.length] = None
+        self.length -= 1
+        if k <= self.length:
+            moved = self.array[k].value
+            self.positions[moved] = k
+            self._sink(k)
+            self._rise(self.positions[moved]) # the moved element can belong below k or above it, as in update_key
+        return item
+
+    def add(self, item: ListItem) -> None:
+        """ Adds an element to the heap, resizing if needed.
+        :complexity: O(log n)
+        :raises ValueError: if its value is already in the heap
+        """
+        if item.value in self.positions:
+            raise ValueError(f"{item.value} is already in the heap")
+        if self.is_full():
+            self._resize()
+        self.length += 1
+        self.array[self.length] = item
+        self.positions[item.value] = self.length
+        self._rise(self.length)
+
+    def update_key(self, value, key) -> None:
+        """ Changes the key of value's element to key and moves it to its new place (up or down).
+        :complexity: O(log n)
+        :raises KeyError: if value is not in the heap
+        """
+        k = self.positions[value]
+        self.array[k].key = key
+        self._sink(k)
+        self._rise(self.positions[value])
+
+    def remove(self, value) -> ListItem:
+        """ Removes and returns value's element, wherever it is in the heap.
+        :complexity: O(log n)
+        :raises KeyError: if value is not in the heap
+        """
+        return self._delete_at(self.positions[value])
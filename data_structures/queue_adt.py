@@ -54,23 +54,39 @@ class CircularQueue(Queue[T]):
          array (ArrayR[T]): array storing the elements of the queue
 
     ArrayR cannot create empty arrays. So MIN_CAPACITY used to avoid this.
+    A growable queue doubles its array when appending to a full one, instead of raising.
     """
     MIN_CAPACITY = 1
 
-    def __init__(self,max_capacity:int) -> None:
+    def __init__(self,max_capacity:int, growable: bool = False) -> None:
         Queue.__init__(self)
         self.front = 0
         self.rear = 0
+        self.growable = growable
         self.array = ArrayR(max(self.MIN_CAPACITY,max_capacity))
 
+    def _resize(self) -> None:
+        """ Doubles the capacity of the queue, unwrapping it so the front is at index 0.
+        :complexity: O(n)
+        """
+        new_array = ArrayR(2 * len(self.array))
+        for i in range(self.length):
+            new_array[i] = self.array[(self.front + i) % len(self.array)]
+        self.array = new_array
+        self.front = 0
+        self.rear = self.length
+
 
     def append(self, item: T) -> None:
         """ Adds an element to the rear of the queue.
-        :pre: queue is not full
-        :raises Exception: if the queue is full
+        :complexity: O(1), amortised for a growable queue
+        :pre: queue is not full, unless it is growable
+        :raises Exception: if the queue is full and not growable
         """
         if self.is_full():
-            raise Exception("Queue is full")
+            if not self.growable:
+                raise Exception("Queue is full")
+            self._resize()
 
         self.array[self.rear] = item
         self.length += 1
@@ -195,6 +211,20 @@ class TestQueue(unittest.TestCase):
             self.assertEqual(len(queue), 0)
             self.assertTrue(queue.is_empty())
 
+    def test_growable(self):
+        queue = CircularQueue(3, growable=True)
+        served = []
+        for i in range(self.CAPACITY):
+            queue.append(i)
+            if i % 3 == 0:
+                served.append(queue.serve()) # so the queue wraps around before it grows
+        while not queue.is_empty():
+            served.append(queue.serve())
+        self.assertEqual(served, list(range(self.CAPACITY)))
+        fixed = CircularQueue(1)
+        fixed.append(0)
+        self.assertRaises(Exception, lambda: fixed.append(1))
+
 if __name__ == '__main__':
     testtorun = TestQueue()
     suite = unittest.TestLoader().loadTestsFromModule(testtorun)
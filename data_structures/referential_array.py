@@ -36,7 +36,7 @@ class ArrayR(Generic[T]):
         if length < 0:
             raise ValueError("Array length should be larger than or equal to 0.")
         self.array = (length * py_object)()  # initialises the space
-        self.array[:] = [None for _ in range(length)]
+        self.array[:] = [None] * length
 
     def __len__(self) -> int:
         """Returns the length of the array
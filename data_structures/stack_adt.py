@@ -56,27 +56,42 @@ class ArrayStack(Stack[T]):
          array (ArrayR[T]): array storing the elements of the queue
 
     ArrayR cannot create empty arrays. So MIN_CAPACITY used to avoid this.
+    A growable stack doubles its array when pushing onto a full one, instead of raising.
     """
     MIN_CAPACITY = 1
 
-    def __init__(self, max_capacity: int) -> None:
+    def __init__(self, max_capacity: int, growable: bool = False) -> None:
         """ Initialises the length and the array with the given capacity.
             If max_capacity is 0, the array is created with MIN_CAPACITY.
+            If growable, max_capacity is only the starting capacity.
         """
         Stack.__init__(self)
+        self.growable = growable
         self.array = ArrayR(max(self.MIN_CAPACITY, max_capacity))
 
     def is_full(self) -> bool:
         """ True if the stack is full and no element can be pushed. """
         return len(self) == len(self.array)
 
+    def _resize(self) -> None:
+        """ Doubles the capacity of the stack.
+        :complexity: O(n)
+        """
+        new_array = ArrayR(2 * len(self.array))
+        for i in range(self.length):
+            new_array[i] = self.array[i]
+        self.array = new_array
+
     def push(self, item: T) -> None:
         """ Pushes an element to the top of the stack.
-        :pre: stack is not full
-        :raises Exception: if the stack is full
+        :complexity: O(1), amortised for a growable stack
+        :pre: stack is not full, unless it is growable
+        :raises Exception: if the stack is full and not growable
         """
         if self.is_full():
-            raise Exception("Stack is full")
+            if not self.growable:
+                raise Exception("Stack is full")
+            self._resize()
         self.array[len(self)] = item
         self.length += 1
 
@@ -183,6 +198,17 @@ class TestStack(unittest.TestCase):
             self.assertEqual(len(stack), 0)
             self.assertTrue(stack.is_empty())
 
+    def test_growable(self):
+        stack = ArrayStack(1, growable=True)
+        for i in range(self.CAPACITY):
+            stack.push(i)
+        self.assertEqual(len(stack), self.CAPACITY)
+        for i in range(self.CAPACITY-1, -1, -1):
+            self.assertEqual(stack.pop(), i)
+        fixed = ArrayStack(1)
+        fixed.push(0)
+        self.assertRaises(Exception, lambda: fixed.push(1))
+
 if __name__ == '__main__':
     testtorun = TestStack()
     suite = unittest.TestLoader().loadTestsFromModule(testtorun)
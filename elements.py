@@ -43,10 +43,13 @@ class Element(BaseEnum):
 Element class based on a case-insensitive comparison of the input string with the names of the elements.'''
     @classmethod
     def from_string(cls, string: str) -> Element:
-        for elem in Element:
-            if elem.name.lower() == string.lower():
-                return elem
-        raise ValueError(f"Unexpected string {string}")
+        elem = _ELEMENT_LOOKUP.get(string.casefold()) #O(1) case-folded lookup table instead of scanning every member
+        if elem is None:
+            raise ValueError(f"Unexpected string {string}")
+        return elem
+
+# Case-folded element name -> Element, built once so from_string is a single dict lookup.
+_ELEMENT_LOOKUP: dict[str, Element] = {elem.name.casefold(): elem for elem in Element}
 
 class EffectivenessCalculator:
     """
@@ -63,7 +66,7 @@ class EffectivenessCalculator:
     def __init__(self, element_names: ArrayR[str], effectiveness_values: ArrayR[float]) -> None:
         """
 
-        :complexity: O(1)
+        :complexity: O(n) -> n = length of element_names (builds the element to row index)
         Initialise the Effectiveness Calculator.
 
         The first parameter is an ArrayR of size n containing all element_names.
@@ -84,11 +87,19 @@ class EffectivenessCalculator:
         """
         self.elements = element_names
         self.effectiveness = effectiveness_values
+        self.n_elements = len(element_names)
+
+        # Row of each Element in the matrix, keyed by Element so a lookup is a single dict access.
+        # Built once here (from_csv/make_singleton) instead of rescanning the header on every call.
+        self.element_rows: dict[Element, int] = {}
+        for row in range(len(element_names)):
+            elem = Element.from_string(element_names[row])
+            self.element_rows[elem] = row
 
     @classmethod
     def get_effectiveness(cls, type1: Element, type2: Element) -> float:
         """
-        :complexity: O(n) -> n = length of elements array 
+        :complexity: O(1)
         :type1: Element of monster attacking
         :type2: Element of monster attacked
 
@@ -97,34 +108,35 @@ class EffectivenessCalculator:
         Example: EffectivenessCalculator.get_effectiveness(Element.FIRE, Element.WATER) == 0.5
         """
 
-        elements = cls.instance.elements # assign elements array to elements variable from singleton instance
-        effectiveness = cls.instance.effectiveness # assign effectivenesss array to elements variable from singleton instance
-
-        type1 = type1.name.lower() #turn first element string to lower case
-        type2 = type2.name.lower() #turn second element string to lower case
-        elements_lowercase_array = ArrayR.from_list([elem.lower() for elem in elements]) # O(n)Create array of element headers all in lowercase
+        instance = cls.instance
+        row1 = instance.element_rows.get(type1) #O(1) row of the attacking element
+        row2 = instance.element_rows.get(type2) #O(1) column of the attacked element
 
-        if type1 in elements_lowercase_array: #O(n) check if the first element exists in the new lowercase array ex. water == water? 
-                index_type1 = elements_lowercase_array.index(type1) #get index value of the first element
-
-                if type2 in elements_lowercase_array: #O(n) check if the second element exists in the new lowercase array ex. water == water?
-                    index_type2 = elements_lowercase_array.index(type2) #get index value of the second element
-
-        else: #raise Exception if first element or second element is not found
+        if row1 is None or row2 is None: #raise Exception if first element or second element is not found
             raise Exception("Please enter valid Elements")
 
-        index = index_type1 * len(elements) + index_type2 #calculate index where the corresponding effectiveness value is
-
-        effectiveness_value = effectiveness[index] #get the value from the effectiveness_value array which contains all effectiveness values
-
-        return effectiveness_value
+        return instance.effectiveness[row1 * instance.n_elements + row2] #get the value from the flat effectiveness matrix
 
-        # for element in elements_lowercase_array:
-        #     if type1 == element.lower():
-        #         index_type1 = elements.index(type1)
+    @classmethod
+    def get_element_row(cls, elem: Element) -> int:
+        """
+        :complexity: O(1)
+        Returns the row/column of elem in the effectiveness matrix.
+        Monster classes resolve this once on creation so attacks can use get_effectiveness_by_row.
+        """
+        row = cls.instance.element_rows.get(elem)
+        if row is None:
+            raise Exception("Please enter valid Elements")
+        return row
 
-        #     if type2 == element.lower():
-        #         index_type2 = elements.index(type2)
+    @classmethod
+    def get_effectiveness_by_row(cls, row1: int, row2: int) -> float:
+        """
+        :complexity: O(1)
+        Same as get_effectiveness, but takes matrix rows already resolved with get_element_row.
+        """
+        instance = cls.instance
+        return instance.effectiveness[row1 * instance.n_elements + row2]
 
     @classmethod
     def from_csv(cls, csv_file: str) -> EffectivenessCalculator:
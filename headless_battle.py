@@ -0,0 +1,268 @@
+"""
+Headless battle engine for running many battles (e.g. tower simulations) quickly.
+
+Gives the same results as Battle.battle, monster for monster (Battle stays the reference), with its own turn loop:
+* each team's action is read into a local integer code once per turn (again only after a swap changed the monsters out),
+* monsters are taken from the team's storage directly (and added to it directly for FRONT and BACK), without MonsterTeam's TeamMode checks,
+* whether a team is empty is asked through len of its storage,
+* the after-attack logic only runs once a monster has fainted,
+* nothing is printed.
+
+choose_action is taken to depend only on the two monsters it is given, as MonsterTeam.choose_action does
+(Battle asks it up to six times a turn and acts on each answer).
+
+Usage:
+```
+engine = HeadlessBattle()
+result = engine.battle(team1, team2)           # a Battle.Result
+code = engine.battle_code(team1, team2)        # HeadlessBattle.TEAM1, TEAM2 or DRAW
+```
+"""
+from __future__ import annotations
+from typing import Callable, Optional
+
+from battle import Battle
+from monster_base import MonsterBase
+from team import MonsterTeam
+
+__docformat__ = 'reStructuredText'
+
+
+class HeadlessBattle:
+
+    # Integer codes for Battle.Action
+    ATTACK = Battle.Action.ATTACK.value
+    SWAP = Battle.Action.SWAP.value
+    SPECIAL = Battle.Action.SPECIAL.value
+
+    # Integer codes for Battle.Result (0 = the battle is still going)
+    NO_RESULT = 0
+    TEAM1 = Battle.Result.TEAM1.value
+    TEAM2 = Battle.Result.TEAM2.value
+    DRAW = Battle.Result.DRAW.value
+
+    RESULTS = {
+        Battle.Result.TEAM1.value: Battle.Result.TEAM1,
+        Battle.Result.TEAM2.value: Battle.Result.TEAM2,
+        Battle.Result.DRAW.value: Battle.Result.DRAW,
+    }
+
+    def __init__(self) -> None:
+        self.team1: MonsterTeam = None
+        self.team2: MonsterTeam = None
+        self.out1: MonsterBase = None
+        self.out2: MonsterBase = None
+        self.result = self.NO_RESULT
+        self.turn_number = 0
+        # Per team, how to take a monster out of it and add one back (see __team_access)
+        self.take1 = self.take2 = None
+        self.put1 = self.put2 = None
+
+    def battle(self, team1: MonsterTeam, team2: MonsterTeam) -> Battle.Result:
+        """
+        Battles team1 against team2 the same way Battle.battle does, without printing.
+
+        :complexity: O(t) turns, each as in Battle.process_turn
+        """
+        return self.RESULTS[self.battle_code(team1, team2)]
+
+    def battle_code(self, team1: MonsterTeam, team2: MonsterTeam) -> int:
+        """
+        Same as battle, but returns the result as TEAM1, TEAM2 or DRAW.
+        Each turn follows Battle.process_turn step for step: swap, special, attacks, then 1 HP off both if neither fainted.
+
+        :complexity: O(t) turns, each as in Battle.process_turn
+        """
+        ATTACK, SWAP, SPECIAL = self.ATTACK, self.SWAP, self.SPECIAL
+        self.turn_number = 0
+        self.team1 = team1
+        self.team2 = team2
+        self.take1, self.put1 = take1, put1 = self.__team_access(team1)
+        self.take2, self.put2 = take2, put2 = self.__team_access(team2)
+        choose1 = self.__chooser(team1)
+        choose2 = self.__chooser(team2)
+        self.result = self.NO_RESULT
+        self.out1 = out1 = take1()
+        self.out2 = out2 = take2()
+
+        while True:
+            for may_swap in (True, False): # the actions, worked out again once if a swap changed the monsters out
+                speed1 = out1.get_speed()
+                speed2 = out2.get_speed()
+                if choose1 is None: # MonsterTeam.choose_action
+                    action1 = ATTACK if speed1 >= speed2 or out1.get_hp() >= out2.get_hp() else SWAP
+                else:
+                    action1 = choose1(out1, out2)
+                if choose2 is None:
+                    action2 = ATTACK if speed2 >= speed1 or out2.get_hp() >= out1.get_hp() else SWAP
+                else:
+                    action2 = choose2(out2, out1)
+
+                if not may_swap:
+                    break
+                if action1 == SWAP:
+                    on_field = out1
+                    self.out1 = out1 = take1()
+                    put1(on_field)
+                elif action2 == SWAP:
+                    on_field = out2
+                    self.out2 = out2 = take2()
+                    put2(on_field)
+                else:
+                    break
+
+            if action1 == SPECIAL:
+                team1.special()
+            elif action2 == SPECIAL:
+                team2.special()
+
+            fainted = False
+            if action1 == ATTACK and action2 == ATTACK:
+                if speed1 > speed2:
+                    out1.attack(out2)
+                    if out2.get_hp() <= 0:
+                        fainted = True
+                        self.__after_faint(out1, out2, 2)
+                    else:
+                        out2.attack(out1)
+                        if out1.get_hp() <= 0:
+                            fainted = True
+                            self.__after_faint(out2, out1, 1)
+                elif speed2 > speed1:
+                    out2.attack(out1)
+                    if out1.get_hp() <= 0:
+                        fainted = True
+                        self.__after_faint(out2, out1, 1)
+                    else:
+                        out1.attack(out2)
+                        if out2.get_hp() <= 0:
+                            fainted = True
+                            self.__after_faint(out1, out2, 2)
+                else:
+                    out1.attack(out2)
+                    out2.attack(out1)
+                    monster1, monster2 = out1, out2
+                    if monster1.get_hp() <= 0:
+                        fainted = True
+                        self.__after_faint(monster2, monster1, 1)
+                    if monster2.get_hp() <= 0:
+                        fainted = True
+                        self.__after_faint(monster1, monster2, 2)
+            elif action1 == ATTACK:
+                out1.attack(out2)
+                if out2.get_hp() <= 0:
+                    fainted = True
+                    self.__after_faint(out1, out2, 2)
+            elif action2 == ATTACK:
+                out2.attack(out1)
+                if out1.get_hp() <= 0:
+                    fainted = True
+                    self.__after_faint(out2, out1, 1)
+
+            if fainted: # the outs may have been replaced
+                out1 = self.out1
+                out2 = self.out2
+            else:
+                out2.set_hp(out2.get_hp() - 1)
+                out1.set_hp(out1.get_hp() - 1)
+                monster1, monster2 = out1, out2
+                if monster2.get_hp() <= 0:
+                    self.__after_faint(monster1, monster2, 2)
+                if monster1.get_hp() <= 0:
+                    self.__after_faint(monster2, monster1, 1)
+                out1 = self.out1
+                out2 = self.out2
+
+            if self.result:
+                return self.result
+
+    def __after_faint(self, attacking_monster: MonsterBase, attacked_monster: MonsterBase, ref_num: int) -> None:
+        """
+        Battle's after-attack logic for an attacked monster that has fainted (ref_num is its team, 1 or 2):
+        sends out the next monster of that team, levels up (and evolves) the attacking monster if it is alive,
+        and sets self.result if the battle is over.
+
+        :complexity: O(1) for FRONT and BACK teams, as MonsterTeam.retrieve_from_team for OPTIMISE
+        """
+        if ref_num == 1:
+            attacking_team, attacked_team = self.team2, self.team1
+            self.out1 = self.take1()
+        else:
+            attacking_team, attacked_team = self.team1, self.team2
+            self.out2 = self.take2()
+
+        if attacking_monster.get_hp() > 0:
+            attacking_monster.level_up()
+            if attacking_monster.ready_to_evolve():
+                if ref_num == 1:
+                    self.out2 = attacking_monster.evolve()
+                else:
+                    self.out1 = attacking_monster.evolve()
+
+        if len(attacked_team.team) == 0:
+            if len(attacking_team.team) == 0 and attacking_monster.get_hp() <= 0:
+                self.result = self.DRAW
+            elif ref_num == 1:
+                self.result = self.TEAM2
+            else:
+                self.result = self.TEAM1
+
+    @staticmethod
+    def __team_access(team: MonsterTeam) -> tuple[Callable[[], MonsterBase], Callable[[MonsterBase], None]]:
+        """
+        (take, put) for team: the same as team.retrieve_from_team and team.add_to_team during a battle,
+        keeping the team's length, other orderings and aggregates as they do.
+        Monsters are taken from the storage directly, and added to it directly for FRONT and BACK
+        (OPTIMISE teams add with add_to_team, for its rules on fainted monsters).
+
+        :complexity: O(1)
+        """
+        storage = team.team
+        if team.team_mode == MonsterTeam.TeamMode.FRONT:
+            take_from, put_in = storage.pop, storage.push
+        elif team.team_mode == MonsterTeam.TeamMode.BACK:
+            take_from, put_in = storage.serve, storage.append
+        else:
+            put_in = None
+
+            def take_from() -> MonsterBase:
+                monster = (storage.get_min() if team.ascending else storage.get_max()).value
+                for _, index in team.other_indexes:
+                    index.remove(monster)
+                return monster
+
+        def take() -> MonsterBase:
+            team.length -= 1
+            monster = take_from()
+            if team.aggregates is not None:
+                team.aggregates.remove(monster)
+            return monster
+
+        def put(monster: MonsterBase) -> None:
+            team.length += 1
+            if len(storage) < team.capacity: # a full team drops the monster, as add_to_team does
+                put_in(monster)
+                if team.aggregates is not None:
+                    team.aggregates.add(monster)
+
+        return take, (team.add_to_team if put_in is None else put)
+
+    @classmethod
+    def __chooser(cls, team: MonsterTeam) -> Optional[Callable[[MonsterBase, MonsterBase], int]]:
+        """
+        Function giving team's action for (out, enemy) as an integer code,
+        None if team uses MonsterTeam.choose_action (battle_code works that one out itself, same rule).
+
+        :complexity: O(1)
+        """
+        if cls.uses_default_choice(team):
+            return None
+
+        def choose(out: MonsterBase, enemy: MonsterBase) -> int:
+            return team.choose_action(out, enemy).value
+        return choose
+
+    @staticmethod
+    def uses_default_choice(team: MonsterTeam) -> bool:
+        """Whether team chooses its actions with MonsterTeam.choose_action (not overridden on its class or the team itself)"""
+        return type(team).choose_action is MonsterTeam.choose_action and "choose_action" not in vars(team)
@@ -1,4 +1,7 @@
 from __future__ import annotations
+import hashlib
+import json
+import os
 import yaml
 from typing import TYPE_CHECKING
 
@@ -6,14 +9,28 @@ from data_structures.referential_array import ArrayR
 
 if TYPE_CHECKING:
     from monster_base import MonsterBase
+    from elements import Element
 
 
 _monsters: ArrayR[MonsterBase] = None
+_registry: MonsterRegistry = None
+# Lazy registry: species name -> parsed roster entry, and species name -> class once that class has been made.
+_roster_entries: dict[str, dict] = None
+# Evolution graph, built with the roster: species name -> chain of names from that species to its final form
+_evolution_graph: dict[str, tuple[str, ...]] = None
+_monster_classes: dict[str, type[MonsterBase]] = {}
+
+MONSTERS_FILE = "monsters.yaml"
+# JSON snapshot of the parsed MONSTERS_FILE, keyed by a hash of its contents so it is rebuilt when the YAML changes.
+# Data only (no pickle), so a tampered snapshot can't run code when helpers is imported.
+SNAPSHOT_FILE = "monsters.snapshot"
+SNAPSHOT_VERSION = 2
 
 
 def MonsterBaseFactory(name, description, evolution, element, simple_stats, complex_stats, can_be_spawned) -> type[MonsterBase]:
     from monster_base import MonsterBase
-    return type(name, (MonsterBase, ), {
+    new_class = type(name, (MonsterBase, ), {
+        "__slots__": (), # no per-instance __dict__, see MonsterBase.__slots__
         "get_name": classmethod(lambda s: name),
         "get_description": classmethod(lambda s: description),
         # This will be defined later when we have all names.
@@ -23,49 +40,229 @@ def MonsterBaseFactory(name, description, evolution, element, simple_stats, comp
         "get_complex_stats": classmethod(lambda s: complex_stats),
         "can_be_spawned": classmethod(lambda s: can_be_spawned),
     })
+    # Resolve the element once per species rather than on every attack (and fail here if it is unknown).
+    new_class.get_element_row()
+    return new_class
 
 def get_all_monsters():
     if _monsters is None:
         _make_all_monster_classes()
     return _monsters
 
-def _make_all_monster_classes():
+def get_registry() -> MonsterRegistry:
+    """Returns the MonsterRegistry over get_all_monsters(), building it the first time."""
+    global _registry
+    if _registry is None:
+        _registry = MonsterRegistry(get_all_monsters())
+    return _registry
+
+class MonsterRegistry:
+    """
+    Indexes over a roster of monster classes, built once so lookups never scan the roster.
+
+    Usage:
+        registry = get_registry()
+        registry.spawnable[k]                  # k-th spawnable species, in roster order
+        registry.get_by_name("Flamikin")       # Flamikin
+        registry.get_species_id(Flamikin)      # position of Flamikin in the roster
+        registry.get_by_element(Element.FIRE)  # ArrayR of all Fire species
+    """
+
+    def __init__(self, monsters: ArrayR[type[MonsterBase]]) -> None:
+        """
+        :complexity: O(n) -> n = number of species in monsters
+        :monsters: ArrayR of monster classes, e.g. get_all_monsters()
+        """
+        from elements import Element
+        self.monsters = monsters
+        self.by_name: dict[str, type[MonsterBase]] = {}
+        self.positions: dict[type[MonsterBase], int] = {} # species -> its position in monsters (species id)
+
+        n_spawnable = 0
+        element_counts: dict[Element, int] = {elem: 0 for elem in Element} # like EffectivenessCalculator.element_rows
+        for x in range(len(monsters)):
+            self.by_name[monsters[x].get_name()] = monsters[x]
+            self.positions[monsters[x]] = x
+            if monsters[x].can_be_spawned():
+                n_spawnable += 1
+            element_counts[monsters[x].get_element_type()] += 1
+
+        # spawnable[k] is the k-th spawnable species and spawnable_positions[k] its position in monsters
+        self.spawnable = ArrayR(n_spawnable)
+        self.spawnable_positions = ArrayR(n_spawnable)
+        self.element_buckets: dict[Element, ArrayR[type[MonsterBase]]] = {}
+        for elem in element_counts:
+            self.element_buckets[elem] = ArrayR(element_counts[elem])
+            element_counts[elem] = 0 # reused as the fill position of each bucket
+
+        cur_spawnable = 0
+        for x in range(len(monsters)):
+            if monsters[x].can_be_spawned():
+                self.spawnable[cur_spawnable] = monsters[x]
+                self.spawnable_positions[cur_spawnable] = x
+                cur_spawnable += 1
+            elem = monsters[x].get_element_type()
+            self.element_buckets[elem][element_counts[elem]] = monsters[x]
+            element_counts[elem] += 1
+
+    def __len__(self) -> int:
+        return len(self.monsters)
+
+    def get_by_name(self, name: str) -> type[MonsterBase]:
+        """
+        :complexity: O(1)
+        :raises KeyError: if there is no species with that name
+        """
+        return self.by_name[name]
+
+    def get_species_id(self, species: type[MonsterBase]) -> int:
+        """
+        :complexity: O(1)
+        Returns the position of species in monsters, which is the same in every process loading the same roster.
+        :raises KeyError: if species is not in the roster (e.g. a subclass made in a test)
+        """
+        return self.positions[species]
+
+    def get_by_element(self, elem: Element) -> ArrayR[type[MonsterBase]]:
+        """
+        :complexity: O(1)
+        Returns the species of element elem, in roster order.
+        """
+        return self.element_buckets[elem]
+
+def _load_roster(yaml_file: str = MONSTERS_FILE, snapshot_file: str = SNAPSHOT_FILE) -> list[dict]:
+    """
+    Returns the parsed roster (stats, formulas and evolution links of every species) from yaml_file.
+
+    Parsing YAML is slow, so the parsed roster is kept in snapshot_file (as JSON) alongside the hash of the YAML it came from.
+    The snapshot is used whenever the hash still matches, and rewritten otherwise (also if it can't be read for any reason).
+    """
+    with open(yaml_file, "rb") as f:
+        raw = f.read()
+    digest = hashlib.sha256(raw).hexdigest()
+
+    try:
+        with open(snapshot_file, "rb") as f:
+            version, snapshot_digest, roster = json.load(f)
+        if version == SNAPSHOT_VERSION and snapshot_digest == digest and isinstance(roster, list):
+            return roster
+    except Exception:
+        pass # missing, unreadable or corrupt snapshot (whatever the error), rebuild it below
+
+    roster = yaml.safe_load(raw)
+    try:
+        tmp_file = f"{snapshot_file}.{os.getpid()}.tmp" # several processes may rebuild at once, os.replace keeps it atomic
+        with open(tmp_file, "w") as f:
+            json.dump([SNAPSHOT_VERSION, digest, roster], f, separators=(",", ":"))
+        os.replace(tmp_file, snapshot_file)
+    except OSError:
+        pass # read-only checkout, just go without the snapshot
+    return roster
+
+def _get_roster_entries() -> dict[str, dict]:
+    """Species name -> parsed roster entry, in roster order. The roster is only loaded the first time this is needed."""
+    global _roster_entries, _evolution_graph
+    if _roster_entries is None:
+        roster_entries = {monster["name"]: monster for monster in _load_roster()}
+        _evolution_graph = _build_evolution_graph(roster_entries)
+        _roster_entries = roster_entries
+    return _roster_entries
+
+def _build_evolution_graph(roster_entries: dict[str, dict]) -> dict[str, tuple[str, ...]]:
+    """
+    Works out every species' evolution chain once, from the evolution links in the roster.
+    A chain runs from the species itself to its final form, e.g. Flamikin -> (Flamikin, Infernoth, Infernox).
+    Several species may evolve into the same one, but each species has at most one evolution, so its chain is unique.
+
+    :complexity: O(n) -> n = number of species (each chain is built from the one after it)
+    :raises ValueError: if an evolution is not in the roster or the evolutions loop
+    """
+    graph: dict[str, tuple[str, ...]] = {}
+    for name in roster_entries:
+        # Walk forward until reaching a species whose chain is known (or the final form)...
+        path = []
+        current = name
+        while current is not None and current not in graph:
+            if current in path:
+                raise ValueError(f"Evolutions of the monsters form a loop through {current}")
+            if current not in roster_entries:
+                raise ValueError(f"{path[-1]} evolves into unknown monster {current}")
+            path.append(current)
+            current = roster_entries[current].get("evolution", None)
+        # ...then fill in the chains on the way back.
+        chain = () if current is None else graph[current]
+        for species in reversed(path):
+            chain = (species,) + chain
+            graph[species] = chain
+    return graph
+
+def get_monster_class(name: str) -> type[MonsterBase]:
+    """
+    Returns the class of the species called name, making it the first time it is asked for.
+
+    :complexity: O(1) once the class exists, O(f) the first time -> f = length of its complex formulas
+    :raises KeyError: if there is no species with that name
+    """
+    new_class = _monster_classes.get(name)
+    if new_class is None:
+        new_class = _make_monster_class(_get_roster_entries()[name])
+    return new_class
+
+def _make_monster_class(monster: dict) -> type[MonsterBase]:
     from stats import SimpleStats, ComplexStats
+    simple = monster["simple"]
+    complex = monster["complex"]
+    complex_stats = ComplexStats(
+        ArrayR.from_list(str(complex["attack"]).split()), ## why would you do this if .split already makes an array?
+        ArrayR.from_list(str(complex["defense"]).split()),
+        ArrayR.from_list(str(complex["speed"]).split()),
+        ArrayR.from_list(str(complex["max_hp"]).split()),
+    )
+    complex_stats.compile_formulas() # compile once here so stat queries don't re-walk the postfix arrays
+    new_class = MonsterBaseFactory(
+        monster["name"],
+        monster["description"],
+        monster.get("evolution", None),
+        monster["element"],
+        SimpleStats(simple["attack"], simple["defense"], simple["speed"], simple["max_hp"]),
+        complex_stats,
+        monster.get("can_be_spawned", False)
+    )
+    # Plain class attributes from the evolution graph, so evolution checks never need to make another class.
+    chain = _evolution_graph[monster["name"]]
+    new_class.evolution_chain = chain
+    new_class.evolution_depth = len(chain) - 1
+    new_class.evolution_name = chain[1] if len(chain) > 1 else None
+    new_class.final_form_name = chain[-1]
+    new_class.can_evolve = new_class.evolution_name is not None
+
+    if new_class.can_evolve:
+        # The evolution may not have been made yet, so the first call makes it and swaps in a constant lookup.
+        def get_evolution(cls, species=new_class, evolution=new_class.evolution_name):
+            evolution_class = get_monster_class(evolution)
+            species.get_evolution = classmethod(lambda s: evolution_class)
+            return evolution_class
+        new_class.get_evolution = classmethod(get_evolution)
+    _monster_classes[monster["name"]] = new_class
+    globals()[monster["name"]] = new_class # later `helpers.<name>` reads skip __getattr__
+    return new_class
+
+def _make_all_monster_classes():
     global _monsters
-    with open("monsters.yaml", "r") as f:
-        monsters_yaml = yaml.safe_load(f)
-    _monsters = ArrayR(len(monsters_yaml))
+    roster = _get_roster_entries()
+    _monsters = ArrayR(len(roster))
     idx = 0
-    for monster in monsters_yaml:
-        simple = monster["simple"]
-        complex = monster["complex"]
-        new_class = MonsterBaseFactory(
-            monster["name"],
-            monster["description"],
-            monster.get("evolution", None),
-            monster["element"],
-            SimpleStats(simple["attack"], simple["defense"], simple["speed"], simple["max_hp"]),
-            ComplexStats(
-                ArrayR.from_list(str(complex["attack"]).split()), ## why would you do this if .split already makes an array?
-                ArrayR.from_list(str(complex["defense"]).split()),
-                ArrayR.from_list(str(complex["speed"]).split()),
-                ArrayR.from_list(str(complex["max_hp"]).split()),
-            ),
-            monster.get("can_be_spawned", False)
-        )
-        globals()[monster["name"]] = new_class ## whats this do (return dict? Looking like what, how can I see what it looks like)
-        _monsters[idx] = new_class
+    for name in roster:
+        _monsters[idx] = get_monster_class(name)
         idx += 1
-    # Now assign evolution
-    for monster in monsters_yaml:
-        evolution = monster.get("evolution", None)
-        if evolution is None:
-            continue
-        evolution_class = globals()[evolution]
-        globals()[monster["name"]].evolution_class = evolution_class
-        globals()[monster["name"]].get_evolution = classmethod(lambda s: s.evolution_class)
-
-get_all_monsters()
+
+def __getattr__(name: str):
+    """
+    Module level __getattr__: `from helpers import Flamikin` makes just the Flamikin class, on first use.
+    """
+    if not name.startswith("__") and name in _get_roster_entries():
+        return get_monster_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 if TYPE_CHECKING:
     # Makes no sense but fixes the red squigglies
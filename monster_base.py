@@ -1,9 +1,11 @@
 from __future__ import annotations
 import abc
 import math
+from typing import Optional
 from elements import Element, EffectivenessCalculator
 
 from stats import Stats
+from data_structures.referential_array import ArrayR
 ''' This is how to commment everything
 what the function does
 complexity of overall function 
@@ -11,6 +13,27 @@ complexity of overall function
 
 class MonsterBase(abc.ABC):
 
+    # Evolution graph of the species, filled in by helpers when the class is made.
+    # can_evolve = None means it isn't known, and get_evolution() is asked instead.
+    can_evolve: Optional[bool] = None
+    evolution_name: Optional[str] = None
+    evolution_depth: Optional[int] = None # evolutions left until the final form
+    evolution_chain: Optional[tuple[str, ...]] = None # names from this species to its final form
+    final_form_name: Optional[str] = None
+
+    # Fixed per-instance layout (no __dict__), we keep millions of monsters alive in simulations.
+    # Factory made species declare empty __slots__ so they keep this layout.
+    __slots__ = (
+        "__simple_mode",
+        "__init_level",
+        "__current_level",
+        "__max_hp",
+        "__defense",
+        "__dmg",
+        "__speed",
+        "__current_hp",
+    )
+
     def __init__(self, simple_mode=True, level:int=1) -> None:
         """
         Initialise an instance of a monster.
@@ -18,20 +41,41 @@ class MonsterBase(abc.ABC):
         :simple_mode: Whether to use the simple or complex stats of this monster
         :level: The starting level of this monster. Defaults to 1.
         """
-        stats = self.get_simple_stats() 
-        self.__max_hp = stats.get_max_hp()
-        self.__defense = stats.get_defense()
-        self.__dmg = stats.get_attack()
-        self.__speed = stats.get_speed()
+        self.__simple_mode = simple_mode
 
         #Inputted values
         self.__init_level = level
         self.__current_level = level
+
+        if simple_mode:
+            stats = self.get_simple_stats() 
+            self.__max_hp = stats.get_max_hp()
+            self.__defense = stats.get_defense()
+            self.__dmg = stats.get_attack()
+            self.__speed = stats.get_speed()
+        else:
+            self.__load_complex_stats()
+
         self.__current_hp = self.get_max_hp()
-        self.__is_alive = True
-        self.__eff_dmg = None
         
 
+    def __load_complex_stats(self):
+        """Reads this monster's stats at its current level from the species' level table (complex mode only)"""
+        stats = self.get_complex_stats()
+        level = self.__current_level
+        self.__max_hp = stats.get_stat(level, stats.MAX_HP)
+        self.__defense = stats.get_stat(level, stats.DEFENSE)
+        self.__dmg = stats.get_stat(level, stats.ATTACK)
+        self.__speed = stats.get_stat(level, stats.SPEED)
+
+    def get_simple_mode(self) -> bool:
+        """Whether this monster instance uses its simple (True) or complex (False) stats"""
+        return self.__simple_mode
+
+    def get_initial_level(self) -> int:
+        """The level this monster instance started at (it can evolve once it is above this)"""
+        return self.__init_level
+
     def get_level(self):
         """The current level of this monster instance"""
         return self.__current_level
@@ -40,6 +84,8 @@ class MonsterBase(abc.ABC):
         """Increase the level of this monster instance by 1"""
         old_max_hp = self.get_max_hp()
         self.__current_level += 1
+        if not self.__simple_mode:
+            self.__load_complex_stats() # table lookups, the formulas are only evaluated the first time a species reaches a level
         self.set_hp( self.get_max_hp() - (old_max_hp - self.get_hp()) )
         return self.__current_level
 
@@ -77,12 +123,7 @@ class MonsterBase(abc.ABC):
 
     def alive(self) -> bool:
         """Whether the current monster instance is alive (HP > 0 )"""
-        if (self.__current_hp <= 0):
-            self.__is_alive = False
-        else:
-            self.__is_alive = True
-
-        return self.__is_alive
+        return self.__current_hp > 0 # worked out from HP rather than stored, one less slot per monster
 
         
 
@@ -90,10 +131,34 @@ class MonsterBase(abc.ABC):
         '''Attack another monster instance
         :param other: The monster being attacked
         '''
+        # Step 1-3 in get_damage (usually a single lookup in the damage table)
+        # Step 4: Lose HP
+        other.set_hp(other.get_hp() - self.get_damage(other)) #apply the damage the other monsters health (i.e set the others monster hp)
+
+    def get_damage(self, other: MonsterBase) -> int:
+        '''
+        The damage this monster deals when it attacks other.
+
+        The damage only depends on the two species (and their levels in complex mode), so it is
+        stored in the damage table the first time and looked up after that. Species whose stat
+        getters or element accessors are overridden (e.g. in subclasses) are always worked out directly.
+
+        :complexity: O(1)
+        :param other: The monster being attacked
+        '''
+        key = (type(self), 0 if self.__simple_mode else self.__current_level, type(other), 0 if other.__simple_mode else other.__current_level)
+        damage = _DAMAGE_TABLE.get(key)
+        if damage is None:
+            damage = self.__compute_damage(other)
+            if _stats_fixed_by_species(key[0]) and _stats_fixed_by_species(key[2]):
+                _DAMAGE_TABLE[key] = damage
+        return damage
+
+    def __compute_damage(self, other: MonsterBase) -> int:
+        '''Works out the damage this monster deals to other, without the damage table'''
         # Step 1: Compute attack stat vs. defense stat
         # Step 2: Apply type effectiveness
         # Step 3: Ceil to int
-        # Step 4: Lose HP
 
         if self.get_attack()/2 > other.get_defense(): #if half your monsters attack is bigger than other monsters defense whole defense
             damage =  self.get_attack() - other.get_defense() #Your attack dmg - their defense 
@@ -105,18 +170,25 @@ class MonsterBase(abc.ABC):
             damage = self.get_attack()/4 #quarter of your attack dmg
 
 
-        your_element = Element.from_string(self.get_element()) # get your element
-        otherMonster_element = Element.from_string(other.get_element()) # get other monsters element
-
-        effectiveness_value = EffectivenessCalculator.get_effectiveness(your_element, otherMonster_element) #get the effectiveness factor
+        # element rows are resolved once per class, see get_element_row
+        effectiveness_value = EffectivenessCalculator.get_effectiveness_by_row(self.get_element_row(), other.get_element_row()) #get the effectiveness factor
 
         eff_dmg = effectiveness_value * damage #multiple it by the damage to get the actual damage (i.e the effective damage)
-        other.set_hp(other.get_hp() - math.ceil(eff_dmg)) #apply the damage the other monsters health (i.e set the others monster hp)
+        return math.ceil(eff_dmg)
 
+    @staticmethod
+    def clear_damage_table() -> None:
+        """Forgets all stored damage and element rows, e.g. after EffectivenessCalculator.make_singleton() loads different values."""
+        _DAMAGE_TABLE.clear()
+        _FIXED_STATS.clear()
+        _ELEMENTS.clear()
 
     def ready_to_evolve(self) -> bool:
         """Whether this monster is ready to evolve. See assignment spec for specific logic."""
-        if self.get_evolution() == None:
+        can_evolve = self.can_evolve # class attribute, so no evolution lookup on every level up
+        if can_evolve is None:
+            can_evolve = self.get_evolution() is not None
+        if not can_evolve:
             return False
         
         if (self.__current_level > self.__init_level):
@@ -133,7 +205,7 @@ class MonsterBase(abc.ABC):
         if (self.ready_to_evolve()):
             evolved_cls = self.get_evolution()
             evolved_monster_obj = evolved_cls.__new__(evolved_cls)
-            evolved_monster_obj.__init__(True,self.__current_level)
+            evolved_monster_obj.__init__(self.__simple_mode,self.__current_level)
              
             hp_increase = evolved_monster_obj.get_max_hp() - self.__max_hp
             new_current_hp = self.__current_hp + hp_increase
@@ -171,6 +243,31 @@ class MonsterBase(abc.ABC):
         """
         pass
 
+    @classmethod
+    def get_final_form(cls) -> type[MonsterBase]:
+        """
+        Returns the class this monster ends up as once it has evolved as far as it can (itself if it can't evolve).
+        Same for all monsters of the same type.
+        """
+        if cls.final_form_name is None:
+            evolution = cls.get_evolution()
+            return cls if evolution is None else evolution.get_final_form()
+        from helpers import get_monster_class
+        return get_monster_class(cls.final_form_name)
+
+    @classmethod
+    def get_evolution_chain(cls) -> ArrayR[type[MonsterBase]]:
+        """
+        Returns the forms this monster goes through, from itself to its final form.
+        Same for all monsters of the same type.
+        """
+        from helpers import get_monster_class
+        chain = cls.evolution_chain or (cls.get_name(),)
+        forms = ArrayR(len(chain))
+        for stage in range(len(chain)):
+            forms[stage] = get_monster_class(chain[stage])
+        return forms
+
     @classmethod
     @abc.abstractmethod
     def get_element(cls) -> str:
@@ -180,6 +277,22 @@ class MonsterBase(abc.ABC):
         """
         pass
 
+    @classmethod
+    def get_element_type(cls) -> Element:
+        """
+        Returns the element of the Monster as an Element.
+        Resolved from get_element once per class (again if the class's get_element is replaced).
+        """
+        return _resolved_element(cls)[1]
+
+    @classmethod
+    def get_element_row(cls) -> int:
+        """
+        Returns the row of the Monster's element in the effectiveness matrix.
+        Resolved from get_element once per class (again if the class's get_element is replaced).
+        """
+        return _resolved_element(cls)[2]
+
     @classmethod
     @abc.abstractmethod
     def can_be_spawned(cls) -> bool:
@@ -206,3 +319,40 @@ class MonsterBase(abc.ABC):
         Same for all monsters of the same type.
         """
         pass
+
+
+# Damage table for MonsterBase.get_damage:
+# (attacker class, attacker level or 0 in simple mode, defender class, defender level or 0) -> damage
+_DAMAGE_TABLE: dict[tuple[type, int, type, int], int] = {}
+# Monster class -> whether its attack, defense and element only come from its species
+_FIXED_STATS: dict[type, bool] = {}
+# Monster class -> (the get_element it was resolved from, its Element, its row in the effectiveness matrix)
+_ELEMENTS: dict[type, tuple[object, Element, int]] = {}
+
+def _stats_fixed_by_species(cls: type[MonsterBase]) -> bool:
+    """
+    Whether cls uses MonsterBase's own attack/defense getters and gets its element from get_element
+    through MonsterBase's element accessors, so its damage can go in the damage table
+    """
+    fixed = _FIXED_STATS.get(cls)
+    if fixed is None:
+        fixed = (
+            cls.get_attack is MonsterBase.get_attack and cls.get_defense is MonsterBase.get_defense
+            and cls.get_element_type.__func__ is MonsterBase.get_element_type.__func__
+            and cls.get_element_row.__func__ is MonsterBase.get_element_row.__func__
+        )
+        _FIXED_STATS[cls] = fixed
+    return fixed
+
+def _resolved_element(cls: type[MonsterBase]) -> tuple[object, Element, int]:
+    """
+    _ELEMENTS entry of cls, made again when cls.get_element is not the one it was resolved from
+    (e.g. a subclass of a species that overrides get_element gets its own entry)
+    """
+    getter = cls.get_element.__func__
+    resolved = _ELEMENTS.get(cls)
+    if resolved is None or resolved[0] is not getter:
+        element = Element.from_string(cls.get_element())
+        resolved = (getter, element, EffectivenessCalculator.get_element_row(element))
+        _ELEMENTS[cls] = resolved
+    return resolved
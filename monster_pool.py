@@ -0,0 +1,208 @@
+"""
+Structure-of-arrays storage for many monsters at once, for running battles in bulk.
+
+Every monster in a MonsterPool is a row index. Its species, level, HP and stats live in NumPy columns,
+so one call attacks, levels up or checks thousands of monsters (e.g. one per independent battle).
+Results are the same as doing the same thing one MonsterBase (in simple mode) at a time.
+
+Usage:
+```
+pool = MonsterPool(1000)
+team1 = pool.spawn(species_ids_1)     # row indices of the new monsters
+team2 = pool.spawn(species_ids_2)
+pool.attack(team1, team2)             # each team1[i] attacks team2[i]
+pool.level_up(team1[pool.alive(team1)])
+```
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from elements import EffectivenessCalculator
+from helpers import get_all_monsters
+from monster_base import MonsterBase
+
+__docformat__ = 'reStructuredText'
+
+
+class MonsterPool:
+    """
+    Pool of monsters stored column-wise. All methods are O(k) in the number of monsters they are given
+    (done by NumPy), unless stated otherwise.
+    """
+
+    MIN_CAPACITY = 1
+
+    # Per-species tables shared by every pool, indexed by species id (position in get_all_monsters()).
+    species_names: dict[str, int] = None
+    species_element_rows: np.ndarray = None
+    species_attack: np.ndarray = None
+    species_defense: np.ndarray = None
+    species_speed: np.ndarray = None
+    species_max_hp: np.ndarray = None
+    effectiveness: np.ndarray = None
+
+    def __init__(self, capacity: int) -> None:
+        """
+        :complexity: O(capacity)
+        :capacity: Number of monsters the pool has room for before it needs to grow.
+        """
+        self._load_species()
+        capacity = max(self.MIN_CAPACITY, capacity)
+        self.length = 0
+        self.species = np.zeros(capacity, dtype=np.int32)
+        self.level = np.zeros(capacity, dtype=np.int64)
+        self.hp = np.zeros(capacity, dtype=np.int64)
+        self.max_hp = np.zeros(capacity, dtype=np.int64)
+        self.attack_stat = np.zeros(capacity, dtype=np.int64)
+        self.defense = np.zeros(capacity, dtype=np.int64)
+        self.speed = np.zeros(capacity, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return self.length
+
+    @classmethod
+    def _load_species(cls) -> None:
+        """
+        Builds the per-species tables from get_all_monsters() and their SimpleStats, the first time a pool is made.
+        :complexity: O(s + e^2) -> s = number of species, e = number of elements
+        """
+        if cls.species_names is not None:
+            return
+        monsters = get_all_monsters()
+        n = len(monsters)
+        names = {}
+        element_rows = np.empty(n, dtype=np.intp)
+        attack = np.empty(n, dtype=np.int64)
+        defense = np.empty(n, dtype=np.int64)
+        speed = np.empty(n, dtype=np.int64)
+        max_hp = np.empty(n, dtype=np.int64)
+        for species in range(n):
+            stats = monsters[species].get_simple_stats()
+            names[monsters[species].get_name()] = species
+            element_rows[species] = monsters[species].get_element_row()
+            attack[species] = stats.get_attack()
+            defense[species] = stats.get_defense()
+            speed[species] = stats.get_speed()
+            max_hp[species] = stats.get_max_hp()
+
+        calculator = EffectivenessCalculator.instance
+        size = calculator.n_elements
+        cls.effectiveness = np.array(calculator.effectiveness.to_list(), dtype=np.float64).reshape(size, size)
+        cls.species_element_rows = element_rows
+        cls.species_attack = attack
+        cls.species_defense = defense
+        cls.species_speed = speed
+        cls.species_max_hp = max_hp
+        cls.species_names = names
+
+    @classmethod
+    def species_id(cls, monster: type[MonsterBase] | str) -> int:
+        """
+        Returns the species id of a monster class (or species name).
+        :complexity: O(1)
+        :raises KeyError: if it isn't in get_all_monsters()
+        """
+        cls._load_species()
+        name = monster if isinstance(monster, str) else monster.get_name()
+        return cls.species_names[name]
+
+    def _grow(self, needed: int) -> None:
+        """
+        Makes room for at least `needed` monsters, doubling the capacity like ArraySortedList._resize.
+        :complexity: O(needed)
+        """
+        capacity = len(self.species)
+        while capacity < needed:
+            capacity *= 2
+        for column in ("species", "level", "hp", "max_hp", "attack_stat", "defense", "speed"):
+            old = getattr(self, column)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.length] = old[:self.length]
+            setattr(self, column, new)
+
+    def spawn(self, species_ids, level=1) -> np.ndarray:
+        """
+        Adds new monsters at full HP, like calling their class with simple_mode=True.
+        Returns the row indices of the new monsters, in the same order as species_ids.
+
+        :species_ids: Species ids (see species_id) of the monsters to add
+        :level: Starting level, either one for all of them or one per monster
+        """
+        species_ids = np.asarray(species_ids, dtype=np.int32).reshape(-1)
+        start = self.length
+        end = start + len(species_ids)
+        if end > len(self.species):
+            self._grow(end)
+
+        self.species[start:end] = species_ids
+        self.level[start:end] = level
+        self.attack_stat[start:end] = self.species_attack[species_ids]
+        self.defense[start:end] = self.species_defense[species_ids]
+        self.speed[start:end] = self.species_speed[species_ids]
+        self.max_hp[start:end] = self.species_max_hp[species_ids]
+        self.hp[start:end] = self.max_hp[start:end]
+        self.length = end
+        return np.arange(start, end)
+
+    def damage(self, attackers, defenders) -> np.ndarray:
+        """
+        Returns the damage each attackers[i] would deal to defenders[i], without applying it.
+        Same as MonsterBase.attack: the three branch attack vs. defense formula, times the
+        element effectiveness, rounded up with ceil.
+        """
+        attackers = np.asarray(attackers)
+        defenders = np.asarray(defenders)
+        attack = self.attack_stat[attackers].astype(np.float64)
+        defense = self.defense[defenders].astype(np.float64)
+
+        damage = np.where(
+            attack / 2 > defense,
+            attack - defense,
+            np.where(attack > defense, 5/8 * attack - defense / 4, attack / 4),
+        )
+        effectiveness = self.effectiveness[
+            self.species_element_rows[self.species[attackers]],
+            self.species_element_rows[self.species[defenders]],
+        ]
+        return np.ceil(effectiveness * damage).astype(np.int64)
+
+    def attack(self, attackers, defenders) -> np.ndarray:
+        """
+        Each attackers[i] attacks defenders[i], and returns the damage dealt.
+        :pre: no monster appears twice in defenders (e.g. one attack per independent battle)
+        """
+        defenders = np.asarray(defenders)
+        damage = self.damage(attackers, defenders)
+        self.set_hp(defenders, self.hp[defenders] - damage)
+        return damage
+
+    def set_hp(self, indices, values) -> None:
+        """
+        Sets the current HP of the given monsters, same as MonsterBase.set_hp
+        (a value above max HP fills the monster up and raises its max HP to that value).
+        :pre: no monster appears twice in indices
+        """
+        indices = np.asarray(indices)
+        values = np.asarray(values, dtype=np.int64)
+        max_hp = self.max_hp[indices]
+        over = values > max_hp
+        self.hp[indices] = np.where(over, max_hp, values)
+        self.max_hp[indices] = np.where(over, values, max_hp)
+
+    def level_up(self, indices) -> None:
+        """
+        Increases the level of the given monsters by 1, same as MonsterBase.level_up in simple mode.
+        :pre: no monster appears twice in indices
+        """
+        indices = np.asarray(indices)
+        old_max_hp = self.max_hp[indices]
+        self.level[indices] += 1
+        # Simple stats don't change with level, this keeps the same HP bookkeeping as MonsterBase.level_up.
+        self.set_hp(indices, self.max_hp[indices] - (old_max_hp - self.hp[indices]))
+
+    def alive(self, indices=None) -> np.ndarray:
+        """Whether each of the given monsters (all of them by default) has HP > 0"""
+        if indices is None:
+            return self.hp[:self.length] > 0
+        return self.hp[np.asarray(indices)] > 0
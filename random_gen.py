@@ -38,6 +38,28 @@ class RandomGen():
         cls.seed = (cls.A * cls.seed + cls.C) % cls.MOD
         return cls.seed >> 16
 
+    @classmethod
+    def random_stream(cls):
+        """
+        Generator giving the same numbers as calling `random` repeatedly, but faster for many numbers at once.
+        The seed is only written back when the generator is closed, so close it before calling anything else here:
+        ```
+        draws = RandomGen.random_stream()
+        try:
+            values = [next(draws) for _ in range(1000)]
+        finally:
+            draws.close()
+        ```
+        """
+        a, c, mod = cls.A, cls.C, cls.MOD
+        seed = cls.seed
+        try:
+            while True:
+                seed = (a * seed + c) % mod
+                yield seed >> 16
+        finally:
+            cls.seed = seed
+
     @classmethod
     def random_float(cls):
         """Returns a random floating point integer in the range 0 to 1."""
@@ -1,4 +1,6 @@
 import abc
+import operator
+from typing import Callable
 
 from data_structures.referential_array import ArrayR
 from data_structures.stack_adt import ArrayStack
@@ -58,6 +60,16 @@ class SimpleStats(Stats):
 
 class ComplexStats(Stats):
 
+    # Columns of the level -> stats table
+    ATTACK = 0
+    DEFENSE = 1
+    SPEED = 2
+    MAX_HP = 3
+    STAT_COUNT = 4
+
+    # Levels the table has room for when first used, doubled whenever a higher level is asked for
+    INITIAL_TABLE_LEVELS = 16
+
     def __init__(self, attack_formula: ArrayR[str], defense_formula: ArrayR[str], speed_formula: ArrayR[str], max_hp_formula: ArrayR[str],) -> None:
         '''
         Cactch all: All functions in this class ComplexStats have a complexity of O(n) except the initialiser
@@ -68,17 +80,207 @@ class ComplexStats(Stats):
         self.speed_formula = speed_formula
         self.max_hp_formula = max_hp_formula
 
+        # Filled in by compile_formulas(), until then the getters fall back to evaluate()
+        self.attack_evaluator = None
+        self.defense_evaluator = None
+        self.speed_evaluator = None
+        self.max_hp_evaluator = None
+
+        # (attack, defense, speed, max_hp) for level 1, then level 2, ... Allocated and filled in lazily, None = not worked out yet
+        self.level_table = None
+
     def get_attack(self, level: int):
-        return self.evaluate(self.attack_formula,level)
+        return self.get_stat(level, self.ATTACK)
 
     def get_defense(self, level: int):
-        return self.evaluate(self.defense_formula, level)
+        return self.get_stat(level, self.DEFENSE)
 
     def get_speed(self, level: int):
-        return self.evaluate(self.speed_formula, level)
+        return self.get_stat(level, self.SPEED)
 
     def get_max_hp(self, level: int):
-        return self.evaluate(self.max_hp_formula, level)
+        return self.get_stat(level, self.MAX_HP)
+
+    def get_stat(self, level: int, column: int) -> int:
+        """
+        :complexity: O(1) once the stat at this level has been worked out, otherwise the cost of one evaluation
+        Looks up one stat at a level in the level table, evaluating and storing it on first use.
+
+        :level: The level of the monster
+        :column: Which stat, one of ATTACK, DEFENSE, SPEED or MAX_HP
+        """
+        if level < 1: # not part of the table, just work it out
+            return self.evaluate_stat(level, column)
+
+        index = (level - 1) * self.STAT_COUNT + column
+        if self.level_table is None or index >= len(self.level_table):
+            self.__grow_table(level)
+
+        value = self.level_table[index]
+        if value is None:
+            value = self.evaluate_stat(level, column)
+            self.level_table[index] = value
+        return value
+
+    def evaluate_stat(self, level: int, column: int) -> int:
+        """
+        :complexity: O(n) -> n = length of the formula for that stat
+        Works out one stat at a level without the table, using the compiled evaluator if there is one.
+        """
+        if column == self.ATTACK:
+            evaluator, formula = self.attack_evaluator, self.attack_formula
+        elif column == self.DEFENSE:
+            evaluator, formula = self.defense_evaluator, self.defense_formula
+        elif column == self.SPEED:
+            evaluator, formula = self.speed_evaluator, self.speed_formula
+        elif column == self.MAX_HP:
+            evaluator, formula = self.max_hp_evaluator, self.max_hp_formula
+        else:
+            raise ValueError(f"Unknown stat column {column}")
+
+        if evaluator is not None:
+            return evaluator(level)
+        return self.evaluate(formula, level)
+
+    def __grow_table(self, level: int) -> None:
+        """
+        :complexity: O(m) -> m = number of levels the new table has room for
+        Makes room in the level table for at least `level` levels, doubling like ArraySortedList._resize.
+        """
+        levels = self.INITIAL_TABLE_LEVELS if self.level_table is None else len(self.level_table) // self.STAT_COUNT
+        while levels < level:
+            levels *= 2
+
+        new_table = ArrayR(levels * self.STAT_COUNT)
+        if self.level_table is not None:
+            for i in range(len(self.level_table)):
+                new_table[i] = self.level_table[i]
+        self.level_table = new_table
+
+    def compile_formulas(self) -> None:
+        """
+        :complexity: O(n) -> n = total length of the four formulas
+        Compiles all four formulas once so the getters no longer walk the postfix arrays.
+        """
+        self.attack_evaluator = self.compile(self.attack_formula)
+        self.defense_evaluator = self.compile(self.defense_formula)
+        self.speed_evaluator = self.compile(self.speed_formula)
+        self.max_hp_evaluator = self.compile(self.max_hp_formula)
+        self.level_table = None # anything stored so far came from the old evaluators
+
+    def evaluate_levels(self, levels) -> "numpy.ndarray":
+        """
+        :complexity: O(n*m) -> n = total length of the four formulas, m = number of levels (done column-wise by NumPy)
+        Returns every stat at every given level as an int ndarray of shape (len(levels), STAT_COUNT),
+        with columns ATTACK, DEFENSE, SPEED and MAX_HP. Results match the per-level getters.
+
+        :levels: Sequence (or ndarray) of levels
+        """
+        import numpy as np
+        levels = np.asarray(levels, dtype=np.float64)
+        grid = np.empty((levels.shape[0], self.STAT_COUNT), dtype=np.int64)
+        grid[:, self.ATTACK] = self.evaluate_batch(self.attack_formula, levels)
+        grid[:, self.DEFENSE] = self.evaluate_batch(self.defense_formula, levels)
+        grid[:, self.SPEED] = self.evaluate_batch(self.speed_formula, levels)
+        grid[:, self.MAX_HP] = self.evaluate_batch(self.max_hp_formula, levels)
+        return grid
+
+    @classmethod
+    def evaluate_roster(cls, roster: ArrayR["ComplexStats"], levels) -> "numpy.ndarray":
+        """
+        :complexity: O(s*n*m) -> s = number of species, n = length of their formulas, m = number of levels
+        Returns the stats of every species at every given level as an int ndarray
+        of shape (len(roster), len(levels), STAT_COUNT).
+
+        :roster: ArrayR of ComplexStats, e.g. the complex stats of every class in get_all_monsters()
+        :levels: Sequence (or ndarray) of levels, a single level gives a grid with one column
+        """
+        import numpy as np
+        levels = np.atleast_1d(np.asarray(levels, dtype=np.float64))
+        grid = np.empty((len(roster), levels.shape[0], cls.STAT_COUNT), dtype=np.int64)
+        for species in range(len(roster)):
+            grid[species] = roster[species].evaluate_levels(levels)
+        return grid
+
+    @staticmethod
+    def evaluate_batch(expression: ArrayR[str], levels) -> "numpy.ndarray":
+        """
+        :complexity: O(n*m) -> n = length of expression array, m = number of levels
+        Vectorised evaluate: evaluates the post-fix expression at every level at once, operating on
+        whole NumPy columns, and truncates to int like evaluate does.
+        Operations that evaluate would fail on (e.g. sqrt of a negative) raise FloatingPointError.
+
+        :expression: Array of the post fix notation for the expression to be calculated
+        :levels: Sequence (or ndarray) of levels
+        """
+        import numpy as np
+        levels = np.asarray(levels, dtype=np.float64)
+        holder = ArrayStack(len(expression))
+
+        with np.errstate(invalid='raise', divide='raise', over='raise'):
+            for element in range(len(expression)): #O(n)
+                token = expression[element]
+                if token is None:
+                    continue
+
+                if token == 'sqrt':
+                    holder.push(np.sqrt(holder.pop()))
+                elif token == 'middle':
+                    a = holder.pop()
+                    b = holder.pop()
+                    c = holder.pop()
+                    holder.push(np.maximum(np.minimum(a, b), np.minimum(np.maximum(a, b), c)))
+                elif token in _BINARY_OPERATORS:
+                    a = holder.pop()
+                    b = holder.pop()
+                    holder.push(_BINARY_OPERATORS[token](b, a)) #works on NumPy columns too
+                elif token == 'level':
+                    holder.push(levels)
+                else:
+                    holder.push(np.float64(token))
+
+            result = np.broadcast_to(holder.pop(), levels.shape)
+            return np.trunc(result).astype(np.int64)
+
+    @staticmethod
+    def compile(expression: ArrayR[str]) -> Callable[[int], int]:
+        """
+        :complexity: O(n) -> n = length of expression array (the returned evaluator is O(n) with no allocations)
+        Turns the post-fix expression into a function of level giving the same result as evaluate.
+
+        Each stack entry is either a float (constant part of the expression, folded now)
+        or a function of level (anything depending on level).
+
+        :expression: Array of the post fix notation for the expression to be calculated
+        """
+        holder = ArrayStack(len(expression))
+
+        for element in range(len(expression)): #O(n)
+            token = expression[element]
+            if token is None:
+                continue
+
+            if token == 'sqrt':
+                holder.push(_combine(math.sqrt, holder.pop()))
+            elif token == 'middle':
+                a = holder.pop()
+                b = holder.pop()
+                c = holder.pop()
+                holder.push(_combine(_median, a, b, c))
+            elif token in _BINARY_OPERATORS:
+                a = holder.pop()
+                b = holder.pop()
+                holder.push(_combine(_BINARY_OPERATORS[token], b, a)) #b is the left operand, same as evaluate
+            elif token == 'level':
+                holder.push(float)
+            else:
+                holder.push(float(token))
+
+        root = holder.pop()
+        if not callable(root):
+            value = int(root)
+            return lambda level: value
+        return lambda level: int(root(level))
     
     def evaluate(self, expression : ArrayR[str], level: int) -> int:
         """
@@ -138,6 +340,41 @@ class ComplexStats(Stats):
 
         final_value = float(holder.pop())
         return int(final_value)
-    
-    
-    
+
+
+_BINARY_OPERATORS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    'power': operator.pow,
+}
+
+def _median(a: float, b: float, c: float) -> float:
+    """Middle value of three numbers, same as the 'middle' operator of ComplexStats.evaluate"""
+    if a > b:
+        a, b = b, a
+    if b > c:
+        b = c
+    return max(a, b)
+
+def _combine(func: Callable, *operands):
+    """
+    Builds the compiled node applying func to operands (each a float or a function of level).
+    Operands that are all constant are folded straight away, unless that raises,
+    in which case the error is left to happen when evaluated (as it would in evaluate).
+    """
+    if not any(callable(operand) for operand in operands):
+        try:
+            return func(*operands)
+        except (ArithmeticError, ValueError):
+            pass
+    getters = tuple(operand if callable(operand) else (lambda level, value=operand: value) for operand in operands)
+    if len(getters) == 1:
+        (x,) = getters
+        return lambda level: func(x(level))
+    if len(getters) == 2:
+        x, y = getters
+        return lambda level: func(x(level), y(level))
+    x, y, z = getters
+    return lambda level: func(x(level), y(level), z(level))
@@ -0,0 +1,209 @@
+"""
+Running totals over the monsters in a team, so whole-team questions don't need a walk of the team.
+
+The team tells a TeamAggregates about every monster it takes in (add) and gives out (remove).
+Monsters are assumed not to change while they sit in the team, which is how battles use them
+(a monster only fights, levels up or evolves after it has been retrieved).
+
+Usage:
+```
+aggregates = TeamAggregates()
+aggregates.add(monster)
+aggregates.get_total(TeamAggregates.HP)       # total HP of the team
+aggregates.get_best(TeamAggregates.SPEED)     # fastest monster in the team
+aggregates.get_element_count(Element.FIRE)    # how many Fire monsters are in the team
+aggregates.remove(monster)
+```
+"""
+from __future__ import annotations
+from operator import add, sub
+from typing import Optional
+
+from elements import Element
+from monster_base import MonsterBase
+
+from data_structures.referential_array import ArrayR
+from data_structures.sorted_list_adt import ListItem
+from data_structures.heap import ArrayMaxHeap
+
+__docformat__ = 'reStructuredText'
+
+
+class TeamAggregates:
+    """
+    Sum and maximum of each stat, and a count of each element, over a changing group of monsters.
+
+    add and remove are O(1) (add is O(log n) amortised once get_best has been used), all queries are O(1) amortised
+    -> n = number of monsters held.
+    """
+
+    # Stats, in the same order as MonsterTeam.SortMode
+    HP = 0
+    ATTACK = 1
+    DEFENSE = 2
+    SPEED = 3
+    LEVEL = 4
+    STAT_COUNT = 5
+
+    NO_ELEMENTS: dict[Element, int] = dict.fromkeys(Element, 0) # copied by clear, iterating Element for every team is slow
+
+    def __init__(self) -> None:
+        self.length = 0
+        self.totals: tuple[int, ...] = (0,) * self.STAT_COUNT # in stat order, replaced as a whole (one step rather than STAT_COUNT)
+        self.values: dict[MonsterBase, tuple[int, ...]] = {} # monster -> its stats when it was added, in stat order
+        # Max heap of ListItem(monster, stat) per stat, only made once that stat's best is asked for (None until then).
+        # Removed monsters are left in the heap and skipped once they reach the top,
+        # an entry only counts if it is the monster's current one in best_entries.
+        self.best = ArrayR(self.STAT_COUNT)
+        self.best_entries = ArrayR(self.STAT_COUNT) # per stat: monster -> its current heap entry
+        self.kept_stats: tuple[int, ...] = () # stats that have a heap
+        self.element_counts: dict[Element, int] = {} # like EffectivenessCalculator.element_rows
+        self.clear()
+
+    def __len__(self) -> int:
+        return self.length
+
+    def clear(self) -> None:
+        """
+        Forgets every monster (and the heaps, until get_best is asked for again).
+        :complexity: O(1)
+        """
+        self.length = 0
+        self.totals = (0,) * self.STAT_COUNT
+        for stat in self.kept_stats:
+            self.best[stat] = None
+            self.best_entries[stat] = None
+        self.kept_stats = ()
+        self.element_counts = self.NO_ELEMENTS.copy()
+        self.values = {}
+
+    @staticmethod
+    def get_stat(monster: MonsterBase, stat: int) -> int:
+        """The value of stat (one of HP, ATTACK, DEFENSE, SPEED, LEVEL) for monster"""
+        if stat == TeamAggregates.HP:
+            return monster.get_hp()
+        elif stat == TeamAggregates.ATTACK:
+            return monster.get_attack()
+        elif stat == TeamAggregates.DEFENSE:
+            return monster.get_defense()
+        elif stat == TeamAggregates.SPEED:
+            return monster.get_speed()
+        elif stat == TeamAggregates.LEVEL:
+            return monster.get_level()
+        raise ValueError(f"stat {stat} not supported.")
+
+    def add(self, monster: MonsterBase) -> None:
+        """
+        Counts monster in.
+        :complexity: O(1), plus O(log n) amortised for each stat whose best has been asked for
+        :raises ValueError: if monster is already counted
+        """
+        if monster in self.values:
+            raise ValueError(f"{monster} is already in the team")
+        values = (monster.get_hp(), monster.get_attack(), monster.get_defense(), monster.get_speed(), monster.get_level())
+        self.values[monster] = values
+        self.totals = tuple(map(add, self.totals, values))
+        for stat in self.kept_stats:
+            entry = ListItem(monster, values[stat])
+            self.best_entries[stat][monster] = entry
+            self.best[stat].add(entry)
+            if len(self.best[stat]) > 2 * len(self.values) + 8: # mostly removed monsters, start the heap over
+                self.__build_heap(stat)
+        self.element_counts[monster.get_element_type()] += 1
+        self.length += 1
+
+    def add_all(self, monsters: list[MonsterBase]) -> None:
+        """
+        Counts in every monster of monsters, the same as add for each in turn but with the totals summed once.
+        :complexity: O(k) -> k = len(monsters), as add for each if get_best has been used
+        :raises ValueError: if a monster is already counted
+        """
+        if self.kept_stats:
+            for monster in monsters:
+                self.add(monster)
+            return
+        values = self.values
+        element_counts = self.element_counts
+        added = []
+        try:
+            for monster in monsters:
+                if monster in values:
+                    raise ValueError(f"{monster} is already in the team")
+                stats = (monster.get_hp(), monster.get_attack(), monster.get_defense(), monster.get_speed(), monster.get_level())
+                values[monster] = stats
+                added.append(stats)
+                element_counts[monster.get_element_type()] += 1
+                self.length += 1
+        finally: # the ones counted before a duplicate stay counted, as with add
+            self.totals = tuple(map(sum, zip(self.totals, *added)))
+
+    def remove(self, monster: MonsterBase) -> None:
+        """
+        Counts monster out, using the stats it had when it was added.
+        :complexity: O(1)
+        :raises ValueError: if monster is not counted
+        """
+        values = self.values.pop(monster, None)
+        if values is None:
+            raise ValueError(f"{monster} is not in the team")
+        self.totals = tuple(map(sub, self.totals, values))
+        for stat in self.kept_stats:
+            del self.best_entries[stat][monster]
+        self.element_counts[monster.get_element_type()] -= 1
+        self.length -= 1
+
+    def get_total(self, stat: int) -> int:
+        """
+        Sum of stat over every monster.
+        :complexity: O(1)
+        """
+        return self.totals[stat]
+
+    def get_best(self, stat: int) -> Optional[MonsterBase]:
+        """
+        A monster with the largest stat (None if there are no monsters).
+        :complexity: O(1) amortised (O(n) the first time for each stat, to make its heap)
+        """
+        heap = self.best[stat]
+        if heap is None:
+            heap = self.__build_heap(stat)
+        entries = self.best_entries[stat]
+        while not heap.is_empty():
+            top = heap.peek_max()
+            if entries.get(top.value) is top:
+                return top.value
+            heap.get_max() # entry of a removed (or since re-added) monster
+        return None
+
+    def get_max(self, stat: int) -> Optional[int]:
+        """
+        Largest stat of any monster (None if there are no monsters).
+        :complexity: O(1) amortised
+        """
+        best = self.get_best(stat)
+        return None if best is None else self.values[best][stat]
+
+    def get_element_count(self, elem: Element) -> int:
+        """
+        How many monsters are of element elem.
+        :complexity: O(1)
+        """
+        return self.element_counts[elem]
+
+    def __build_heap(self, stat: int) -> ArrayMaxHeap:
+        """
+        Makes a new heap for stat from just the current monsters, kept up to date from then on.
+        :complexity: O(n)
+        """
+        heap = ArrayMaxHeap(len(self.values))
+        entries = {}
+        for monster, values in self.values.items():
+            entries[monster] = ListItem(monster, values[stat])
+            heap.length += 1
+            heap.array[heap.length] = entries[monster]
+        heap.heapify()
+        if self.best[stat] is None:
+            self.kept_stats += (stat,)
+        self.best[stat] = heap
+        self.best_entries[stat] = entries
+        return heap
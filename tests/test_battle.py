@@ -1,10 +1,14 @@
+import sys
+from io import StringIO
 from unittest import TestCase
 
 from ed_utils.decorators import number, visibility
 from ed_utils.timeout import timeout
 
 from battle import Battle
+from headless_battle import HeadlessBattle
 from team import MonsterTeam
+from random_gen import RandomGen
 from helpers import Flamikin, Aquariuma, Vineon, Strikeon, Normake, Marititan, Leviatitan, Treetower, Infernoth
 
 from data_structures.referential_array import ArrayR
@@ -133,3 +137,64 @@ class TestBattle(TestCase):
         ]
         res = b.battle(team1, team2)
         self.assertEqual(res, Battle.Result.DRAW)
+
+    @number("4.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_headless_simple_battle(self):
+        def make_teams():
+            team1 = MonsterTeam(
+                team_mode=MonsterTeam.TeamMode.BACK,
+                selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+                provided_monsters=ArrayR.from_list([Aquariuma, Aquariuma])
+            )
+            team2 = MonsterTeam(
+                team_mode=MonsterTeam.TeamMode.FRONT,
+                selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+                provided_monsters=ArrayR.from_list([Aquariuma, Aquariuma])
+            )
+            # Make them always attack, so the headless engine has to ask the teams
+            team1.choose_action = lambda out, team: Battle.Action.ATTACK
+            team2.choose_action = lambda out, team: Battle.Action.ATTACK
+            return team1, team2
+
+        engine = HeadlessBattle()
+        team1, team2 = make_teams()
+        self.assertFalse(engine.uses_default_choice(team1))
+        self.assertEqual(engine.battle(team1, team2), Battle.Result.DRAW)
+        team1, team2 = make_teams()
+        self.assertEqual(engine.battle_code(team1, team2), HeadlessBattle.DRAW)
+
+    @number("4.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_headless_matches_battle(self):
+        modes = (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK, MonsterTeam.TeamMode.OPTIMISE)
+
+        def make_pairs():
+            RandomGen.set_seed(123)
+            pairs = []
+            for i in range(150):
+                team1 = MonsterTeam.generate_random_teams(1, modes[i % 3], sort_key=MonsterTeam.SortMode.HP)[0]
+                team2 = MonsterTeam.generate_random_teams(1, modes[i // 3 % 3], sort_key=MonsterTeam.SortMode.SPEED)[0]
+                pairs.append((team1, team2))
+            return pairs
+
+        def run(engine, pairs):
+            # Some of these battles raise (as Battle does), those have to raise the same way
+            results = []
+            for team1, team2 in pairs:
+                try:
+                    result = engine.battle(team1, team2)
+                    results.append((result, str(engine.out1), str(engine.out2), len(team1), len(team2)))
+                except Exception as e:
+                    results.append(repr(e))
+            return results
+
+        captured_output = StringIO()
+        sys.stdout = captured_output
+        try:
+            expected = run(Battle(verbosity=0), make_pairs())
+        finally:
+            sys.stdout = sys.__stdout__
+        self.assertEqual(run(HeadlessBattle(), make_pairs()), expected)
@@ -1,3 +1,4 @@
+import importlib.util
 from unittest import TestCase
 
 from ed_utils.decorators import number, visibility
@@ -17,3 +18,36 @@ class TestElementEffectiveness(TestCase):
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.DRAGON, Element.DRAGON), 2)
         self.assertEqual(EffectivenessCalculator.get_effectiveness(Element.WATER, Element.GRASS), 0.5)
 
+    @number("2.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_effectiveness_matrix_matches_csv(self):
+        calc = EffectivenessCalculator.instance
+        names = [name.lower() for name in calc.elements.to_list()]
+        for elem1 in Element:
+            for elem2 in Element:
+                expected = calc.effectiveness[names.index(elem1.name.lower()) * len(names) + names.index(elem2.name.lower())]
+                self.assertEqual(EffectivenessCalculator.get_effectiveness(elem1, elem2), expected)
+
+    @number("2.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_hashable_across_imports(self):
+        # elements.py loaded a second time under another name, as if imported from a different location
+        spec = importlib.util.spec_from_file_location("elements_copy", importlib.util.find_spec("elements").origin)
+        elements_copy = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(elements_copy)
+        fire_copy = elements_copy.Element.FIRE
+
+        self.assertIsNot(fire_copy, Element.FIRE)
+        self.assertEqual(fire_copy, Element.FIRE)
+        self.assertNotEqual(fire_copy, Element.WATER)
+        self.assertNotEqual(Element.FIRE, 1)
+        self.assertEqual(hash(fire_copy), hash(Element.FIRE))
+        self.assertIs(fire_copy.canonical, Element.FIRE)
+
+        rows = {elem: elem.value for elem in Element}
+        self.assertEqual(len(rows), len(Element))
+        self.assertEqual(rows[fire_copy], Element.FIRE.value)
+        self.assertIn(elements_copy.Element.GHOST, set(Element))
+        self.assertEqual(EffectivenessCalculator.get_effectiveness(fire_copy, elements_copy.Element.WATER), 0.5)
@@ -0,0 +1,119 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+from data_structures.heap import ArrayMaxHeap, ArrayMinMaxHeap, IndexedMinMaxHeap
+from data_structures.sorted_list_adt import ListItem
+
+class TestArrayMaxHeap(TestCase):
+
+    @number("8.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_add_and_get_max(self):
+        heap = ArrayMaxHeap(2) # small so adding has to resize
+        keys = [5, 1, 9, 3, 9, -2, 7, 0]
+        for key in keys:
+            heap.add(ListItem(str(key), key))
+        self.assertEqual(len(heap), len(keys))
+        self.assertEqual(heap.peek_max().key, 9)
+        got = [heap.get_max().key for _ in range(len(keys))]
+        self.assertEqual(got, sorted(keys, reverse=True))
+        self.assertTrue(heap.is_empty())
+        self.assertRaises(IndexError, heap.get_max)
+
+    @number("8.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_heapify(self):
+        heap = ArrayMaxHeap(10)
+        keys = [4, 8, 1, 6, 2]
+        for key in keys:
+            heap.add(ListItem(key, key))
+        for i in range(1, len(heap) + 1):
+            heap.array[i].key = -heap.array[i].key
+        heap.heapify()
+        got = [heap.get_max().value for _ in range(len(keys))]
+        self.assertEqual(got, sorted(keys))
+
+
+class TestArrayMinMaxHeap(TestCase):
+
+    @number("8.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_both_ends(self):
+        for seed in range(20):
+            heap = ArrayMinMaxHeap(1) # small so adding has to resize
+            keys = [(seed * 7919 + i * 104729) % 37 for i in range(seed + 5)]
+            for key in keys:
+                heap.add(ListItem(key, key))
+            expected = sorted(keys)
+            take_max = seed % 2 == 0
+            while expected:
+                if take_max:
+                    self.assertEqual(heap.peek_max().key, expected[-1])
+                    self.assertEqual(heap.get_max().key, expected.pop())
+                else:
+                    self.assertEqual(heap.peek_min().key, expected[0])
+                    self.assertEqual(heap.get_min().key, expected.pop(0))
+                take_max = not take_max
+            self.assertTrue(heap.is_empty())
+        self.assertRaises(IndexError, heap.get_min)
+        self.assertRaises(IndexError, heap.get_max)
+
+
+class TestIndexedMinMaxHeap(TestCase):
+
+    @number("8.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_update_key_and_remove(self):
+        for seed in range(20):
+            heap = IndexedMinMaxHeap(1)
+            keys = {i: (seed * 7919 + i * 104729) % 37 for i in range(seed + 5)}
+            for value, key in keys.items():
+                heap.add(ListItem(value, key))
+            self.assertRaises(ValueError, lambda: heap.add(ListItem(0, 0)))
+            for step in range(len(keys)):
+                value = (seed + step * 3) % len(keys)
+                if value not in heap:
+                    continue
+                if step % 4 == 3:
+                    self.assertEqual(heap.remove(value).key, keys.pop(value))
+                else:
+                    keys[value] = (keys[value] * 5 + step) % 41 - 10
+                    heap.update_key(value, keys[value])
+                for i in range(1, len(heap) + 1):
+                    self.assertEqual(heap.positions[heap.array[i].value], i)
+            expected = sorted(keys.values())
+            take_max = seed % 2 == 0
+            while expected:
+                if take_max:
+                    self.assertEqual(heap.get_max().key, expected.pop())
+                else:
+                    self.assertEqual(heap.get_min().key, expected.pop(0))
+                take_max = not take_max
+            self.assertEqual(heap.positions, {})
+
+    @number("8.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_remove_from_middle(self):
+        # The last element moved into the hole can belong below it or above it, it only shows with a few levels
+        for seed in range(200):
+            size = 11 + seed % 30
+            heap = IndexedMinMaxHeap(1)
+            keys = {i: (seed * 7919 + i * 104729) % 53 for i in range(size)}
+            for value, key in keys.items():
+                heap.add(ListItem(value, key))
+            for step in range(3):
+                value = (seed + step * 7) % size
+                if value in heap:
+                    self.assertEqual(heap.remove(value).key, keys.pop(value))
+            expected = sorted(keys.values())
+            if seed % 2 == 0:
+                self.assertEqual([heap.get_min().key for _ in range(len(expected))], expected)
+            else:
+                self.assertEqual([heap.get_max().key for _ in range(len(expected))], expected[::-1])
@@ -0,0 +1,104 @@
+import os
+import tempfile
+from unittest import TestCase
+
+import yaml
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+
+import helpers
+
+class TestHelpers(TestCase):
+
+    @number("6.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_roster_snapshot(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            yaml_file = os.path.join(tmp, "monsters.yaml")
+            snapshot_file = os.path.join(tmp, "monsters.snapshot")
+            with open(helpers.MONSTERS_FILE, "r") as f:
+                original = f.read()
+            with open(yaml_file, "w") as f:
+                f.write(original)
+
+            roster = helpers._load_roster(yaml_file, snapshot_file)
+            self.assertEqual(roster, yaml.safe_load(original))
+            self.assertTrue(os.path.exists(snapshot_file))
+            # Second load comes from the snapshot
+            self.assertEqual(helpers._load_roster(yaml_file, snapshot_file), roster)
+
+            # Changing the YAML rebuilds the snapshot
+            with open(yaml_file, "w") as f:
+                f.write(original.replace("name: Flamikin", "name: Flamikinn"))
+            changed = helpers._load_roster(yaml_file, snapshot_file)
+            self.assertIn("Flamikinn", [monster["name"] for monster in changed])
+            self.assertEqual(helpers._load_roster(yaml_file, snapshot_file), changed)
+
+            # A corrupt snapshot (or one in another format) is rebuilt, never executed
+            for corrupt in (b"", b"\x80\x04\x95garbage", b"[2, 1]", b'{"a": 1}', b"9" * 5000):
+                with open(snapshot_file, "wb") as f:
+                    f.write(corrupt)
+                self.assertEqual(helpers._load_roster(yaml_file, snapshot_file), changed)
+                self.assertEqual(helpers._load_roster(yaml_file, snapshot_file), changed)
+
+    @number("6.2")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_lazy_monster_classes(self):
+        from helpers import Metalhorn
+        self.assertIs(helpers.get_monster_class("Metalhorn"), Metalhorn)
+        self.assertIs(Metalhorn.get_evolution(), helpers.Ironclad)
+        self.assertRaises(AttributeError, lambda: helpers.Missingno)
+        self.assertRaises(KeyError, lambda: helpers.get_monster_class("Missingno"))
+
+        monsters = helpers.get_all_monsters()
+        self.assertEqual(len(monsters), len(helpers._get_roster_entries()))
+        for monster in monsters:
+            self.assertIs(helpers.get_monster_class(monster.get_name()), monster)
+
+    @number("6.3")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_registry(self):
+        from elements import Element
+        monsters = helpers.get_all_monsters()
+        registry = helpers.get_registry()
+        self.assertIs(registry, helpers.get_registry())
+
+        spawnable = [monster for monster in monsters if monster.can_be_spawned()]
+        self.assertListEqual(registry.spawnable.to_list(), spawnable)
+        for k in range(len(registry.spawnable)):
+            self.assertIs(monsters[registry.spawnable_positions[k]], registry.spawnable[k])
+
+        self.assertIs(registry.get_by_name("Flamikin"), helpers.Flamikin)
+        self.assertRaises(KeyError, lambda: registry.get_by_name("Missingno"))
+        for elem in Element:
+            expected = [monster for monster in monsters if monster.get_element_type() == elem]
+            self.assertListEqual(registry.get_by_element(elem).to_list(), expected)
+
+    @number("6.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_evolution_graph(self):
+        from helpers import Flamikin, Infernoth, Infernox
+        self.assertEqual(Flamikin.evolution_chain, ("Flamikin", "Infernoth", "Infernox"))
+        self.assertEqual(Flamikin.evolution_depth, 2)
+        self.assertEqual(Infernox.evolution_depth, 0)
+        self.assertTrue(Flamikin.can_evolve)
+        self.assertFalse(Infernox.can_evolve)
+        self.assertIs(Flamikin.get_evolution(), Infernoth)
+        self.assertIs(Flamikin.get_final_form(), Infernox)
+        self.assertIs(Infernox.get_final_form(), Infernox)
+        self.assertListEqual(Flamikin.get_evolution_chain().to_list(), [Flamikin, Infernoth, Infernox])
+
+        # Two species may share an evolution, but loops and unknown evolutions are rejected
+        graph = helpers._build_evolution_graph({
+            "A": {"evolution": "C"}, "B": {"evolution": "C"}, "C": {},
+        })
+        self.assertEqual(graph, {"A": ("A", "C"), "B": ("B", "C"), "C": ("C",)})
+        self.assertRaises(ValueError, lambda: helpers._build_evolution_graph({
+            "A": {"evolution": "B"}, "B": {"evolution": "A"},
+        }))
+        self.assertRaises(ValueError, lambda: helpers._build_evolution_graph({"A": {"evolution": "B"}}))
@@ -4,9 +4,10 @@ from ed_utils.decorators import number, visibility
 from ed_utils.timeout import timeout
 
 from monster_base import MonsterBase
+from elements import Element, EffectivenessCalculator
 # These classes inherit from MonsterBase,
 # but you don't need to implement them explicitly.
-from helpers import Infernox, Ironclad, Metalhorn
+from helpers import Infernox, Ironclad, Metalhorn, Flamikin
 
 class TestMonsters(TestCase):
 
@@ -81,3 +82,63 @@ class TestMonsters(TestCase):
         print('\nnewCURRENT HP OF MONSTER::: {}\n'.format(t.get_hp()))
         self.assertEqual(t.get_hp(), 12)
 
+
+    @number("1.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_element_type(self):
+        self.assertEqual(Infernox.get_element_type(), Element.FIRE)
+        self.assertEqual(Metalhorn.get_element_type(), Element.STEEL)
+        self.assertEqual(Element.from_string("sTeEl"), Element.STEEL)
+        self.assertRaises(ValueError, lambda: Element.from_string("Plasma"))
+        self.assertEqual(
+            EffectivenessCalculator.get_effectiveness_by_row(Infernox.get_element_row(), Metalhorn.get_element_row()),
+            EffectivenessCalculator.get_effectiveness(Element.FIRE, Element.STEEL),
+        )
+
+    @number("1.7")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_slots(self):
+        monster = Infernox()
+        self.assertFalse(hasattr(monster, "__dict__"))
+        self.assertRaises(AttributeError, lambda: setattr(monster, "nickname", "Blaze"))
+        self.assertTrue(monster.alive())
+        monster.set_hp(0)
+        self.assertFalse(monster.alive())
+
+    @number("1.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_damage_table(self):
+        class StrongInfernox(Infernox):
+            def get_attack(self):
+                return 100
+
+        MonsterBase.clear_damage_table()
+        attacker, defender = Infernox(), Metalhorn()
+        attacker.attack(defender)
+        # Fire vs Steel: 8 attack against 8 defense is 8/4 = 2 damage, doubled
+        self.assertEqual(defender.get_hp(), defender.get_max_hp() - 4)
+        self.assertEqual(Infernox().get_damage(Metalhorn()), 4)
+        # Overridden stats are not mixed up with the stored damage of the species
+        self.assertEqual(StrongInfernox().get_damage(Metalhorn()), 2 * (100 - 8))
+        self.assertEqual(Infernox().get_damage(Metalhorn()), 4)
+
+    @number("1.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_overridden_element(self):
+        class WaterFlamikin(Flamikin):
+            @classmethod
+            def get_element(cls):
+                return "Water"
+
+        self.assertEqual(Flamikin.get_element_type(), Element.FIRE)
+        self.assertEqual(WaterFlamikin.get_element_type(), Element.WATER)
+        self.assertEqual(WaterFlamikin.get_element_row(), EffectivenessCalculator.get_element_row(Element.WATER))
+        # 3 attack against 3 defense is 3/4, then doubled for Water vs Fire and halved for Fire vs Fire
+        MonsterBase.clear_damage_table()
+        self.assertEqual(Flamikin().get_damage(Flamikin()), 1)
+        self.assertEqual(WaterFlamikin().get_damage(Flamikin()), 2)
+        self.assertEqual(Flamikin().get_damage(Flamikin()), 1)
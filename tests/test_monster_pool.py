@@ -0,0 +1,45 @@
+from unittest import TestCase
+
+from ed_utils.decorators import number, visibility
+from ed_utils.timeout import timeout
+from random_gen import RandomGen
+
+from helpers import get_all_monsters
+from monster_pool import MonsterPool
+
+class TestMonsterPool(TestCase):
+
+    @number("7.1")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_matches_monster_base(self):
+        RandomGen.set_seed(123456789)
+        monsters = get_all_monsters()
+        n = 400
+        species1 = [RandomGen.randint(0, len(monsters) - 1) for _ in range(n)]
+        species2 = [RandomGen.randint(0, len(monsters) - 1) for _ in range(n)]
+
+        pool = MonsterPool(16) # small so spawning has to grow it
+        team1 = pool.spawn(species1)
+        team2 = pool.spawn(species2, level=3)
+        objects1 = [monsters[s]() for s in species1]
+        objects2 = [monsters[s](level=3) for s in species2]
+        self.assertEqual(len(pool), 2 * n)
+        self.assertEqual(MonsterPool.species_id(monsters[species1[0]]), species1[0])
+
+        for _ in range(3):
+            pool.attack(team1, team2)
+            pool.attack(team2, team1)
+            for m1, m2 in zip(objects1, objects2):
+                m1.attack(m2)
+                m2.attack(m1)
+            survivors = team1[pool.alive(team1)]
+            pool.level_up(survivors)
+            for i in survivors:
+                objects1[i].level_up()
+
+            self.assertListEqual(pool.hp[team1].tolist(), [m.get_hp() for m in objects1])
+            self.assertListEqual(pool.hp[team2].tolist(), [m.get_hp() for m in objects2])
+            self.assertListEqual(pool.max_hp[team2].tolist(), [m.get_max_hp() for m in objects2])
+            self.assertListEqual(pool.level[team1].tolist(), [m.get_level() for m in objects1])
+            self.assertListEqual(pool.alive(team2).tolist(), [m.alive() for m in objects2])
@@ -59,3 +59,69 @@ class TestStats(TestCase):
         self.assertEqual(cs.get_defense(1), 8)
         self.assertEqual(cs.get_speed(5), 250)
         self.assertEqual(cs.get_max_hp(41), 6)
+
+    @number("4.4")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_compiled_formulas_match_evaluate(self):
+        formulas = [
+            ["5", "6", "+"],
+            ["9", "2", "8", "middle"],
+            ["level", "3", "power", "1", "2", "3", "middle", "*"],
+            ["level", "5", "-", "sqrt", "1", "10", "middle"],
+            ["level", "7", "/", "level", "level", "*", "2", "middle", "1", "-"],
+            ["3"],
+        ]
+        cs = ComplexStats(*[ArrayR.from_list(formula) for formula in formulas[:4]])
+        for formula in formulas:
+            expression = ArrayR.from_list(formula)
+            compiled = ComplexStats.compile(expression)
+            for level in range(5, 60):
+                self.assertEqual(compiled(level), cs.evaluate(expression, level))
+
+        cs.compile_formulas()
+        self.assertEqual(cs.get_attack(1), 11)
+        self.assertEqual(cs.get_defense(1), 8)
+        self.assertEqual(cs.get_speed(5), 250)
+        self.assertEqual(cs.get_max_hp(41), 6)
+
+    @number("4.5")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_level_table(self):
+        attack = ArrayR.from_list(["level", "2", "*"])
+        max_hp = ArrayR.from_list(["level", "5", "-", "sqrt", "1", "10", "middle"])
+        cs = ComplexStats(attack, attack, attack, max_hp)
+        self.assertIsNone(cs.level_table)
+        # Only the requested stat gets worked out, max_hp is invalid below level 5.
+        self.assertEqual(cs.get_max_hp(41), 6)
+        self.assertIsNone(cs.level_table[(41 - 1) * cs.STAT_COUNT + cs.ATTACK])
+        for level in range(1, 100):
+            self.assertEqual(cs.get_attack(level), cs.evaluate(attack, level))
+        self.assertEqual(cs.level_table[(99 - 1) * cs.STAT_COUNT + cs.ATTACK], 198)
+        self.assertEqual(cs.get_max_hp(41), 6)
+
+    @number("4.6")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_batch_evaluation(self):
+        cs = ComplexStats(
+            ArrayR.from_list(["5", "6", "+"]),
+            ArrayR.from_list(["level", "7", "/", "level", "level", "*", "2", "middle", "1", "-"]),
+            ArrayR.from_list(["level", "3", "power", "1", "2", "3", "middle", "*"]),
+            ArrayR.from_list(["level", "5", "-", "sqrt", "1", "10", "middle"]),
+        )
+        levels = list(range(5, 60))
+        grid = cs.evaluate_levels(levels)
+        self.assertEqual(grid.shape, (len(levels), ComplexStats.STAT_COUNT))
+        for row, level in enumerate(levels):
+            self.assertListEqual(
+                grid[row].tolist(),
+                [cs.get_attack(level), cs.get_defense(level), cs.get_speed(level), cs.get_max_hp(level)],
+            )
+        # sqrt of a negative number fails just like evaluate does
+        self.assertRaises(ArithmeticError, lambda: cs.evaluate_levels([1]))
+
+        roster = ArrayR.from_list([cs, cs])
+        self.assertEqual(ComplexStats.evaluate_roster(roster, 41).shape, (2, 1, ComplexStats.STAT_COUNT))
+        self.assertListEqual(ComplexStats.evaluate_roster(roster, levels)[1].tolist(), grid.tolist())
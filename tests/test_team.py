@@ -8,7 +8,7 @@ from ed_utils.timeout import timeout
 from random_gen import RandomGen
 
 from team import MonsterTeam
-from helpers import Flamikin, Aquariuma, Vineon, Normake, Thundrake, Rockodile, Mystifly, Strikeon, Faeboa, Soundcobra
+from helpers import Flamikin, Aquariuma, Vineon, Normake, Thundrake, Rockodile, Mystifly, Strikeon, Faeboa, Soundcobra, get_registry
 
 from data_structures.referential_array import ArrayR
 
@@ -273,3 +273,381 @@ class TestTeam(TestCase):
 
         self.assertEqual(len(team), 1)
         self.assertIsInstance(team.retrieve_from_team(), Flamikin)
+
+    @number("3.8")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_optimise_special_toggle(self):
+        my_monsters = ArrayR.from_list([Flamikin, Aquariuma, Rockodile]) # 6, 8 and 9 HP
+        team = MonsterTeam(
+            team_mode=MonsterTeam.TeamMode.OPTIMISE,
+            selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+            sort_key=MonsterTeam.SortMode.HP,
+            provided_monsters=my_monsters,
+        )
+        team.special()
+        # Ascending: Flamikin, Aquariuma, Rockodile
+        flamikin = team.retrieve_from_team()
+        self.assertIsInstance(flamikin, Flamikin)
+        # Added back in the right place for the current direction
+        flamikin.set_hp(7)
+        team.add_to_team(flamikin)
+        self.assertIsInstance(team.retrieve_from_team(), Flamikin)
+        team.add_to_team(flamikin)
+        team.special()
+        team.special()
+        self.assertIsInstance(team.retrieve_from_team(), Flamikin)
+        # Descending again: Rockodile, Aquariuma
+        team.special()
+        self.assertIsInstance(team.retrieve_from_team(), Rockodile)
+        self.assertIsInstance(team.retrieve_from_team(), Aquariuma)
+
+    @number("3.9")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_regenerate_repeatedly(self):
+        for team_mode in (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK, MonsterTeam.TeamMode.OPTIMISE):
+            team = MonsterTeam(
+                team_mode=team_mode,
+                selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+                sort_key=MonsterTeam.SortMode.HP,
+                provided_monsters=ArrayR.from_list([Flamikin, Aquariuma, Rockodile]),
+            )
+            first = [team.retrieve_from_team() for _ in range(3)]
+            for _ in range(3):
+                for monster in first:
+                    monster.set_hp(1)
+                team.regenerate_team()
+                self.assertEqual(len(team), 3)
+                again = [team.retrieve_from_team() for _ in range(3)]
+                self.assertListEqual([type(m) for m in again], [type(m) for m in first])
+                self.assertListEqual([m.get_hp() for m in again], [m.get_max_hp() for m in again])
+                first = again
+
+    @number("3.10")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_iteration_does_not_change_team(self):
+        for team_mode in (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK, MonsterTeam.TeamMode.OPTIMISE):
+            for use_special in (False, True):
+                team = MonsterTeam(
+                    team_mode=team_mode,
+                    selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+                    sort_key=MonsterTeam.SortMode.HP,
+                    provided_monsters=ArrayR.from_list([Flamikin, Aquariuma, Rockodile, Vineon]),
+                )
+                if use_special:
+                    team.special()
+                seen = list(team)
+                self.assertListEqual(list(team), seen)
+                self.assertListEqual(team.get_lineup().to_list(), seen)
+                for index in range(len(seen)):
+                    self.assertIs(team.peek(index), seen[index])
+                self.assertRaises(IndexError, lambda: team.peek(len(seen)))
+                self.assertListEqual([team.retrieve_from_team() for _ in range(len(seen))], seen)
+
+    @number("3.11")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_generate_random_teams(self):
+        for team_mode in (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK):
+            RandomGen.set_seed(1234)
+            expected = [MonsterTeam(team_mode, MonsterTeam.SelectionMode.RANDOM) for _ in range(20)]
+            seed_after = RandomGen.seed
+
+            teams = MonsterTeam.generate_random_teams(20, team_mode, seed=1234)
+            self.assertEqual(RandomGen.seed, seed_after)
+            self.assertEqual(len(teams), 20)
+            for team, other in zip(teams, expected):
+                self.assertEqual(len(team), len(other))
+                self.assertListEqual([type(m) for m in team], [type(m) for m in other])
+                team.retrieve_from_team().set_hp(0)
+                team.regenerate_team()
+                self.assertListEqual([type(m) for m in team], [type(m) for m in other])
+
+    @number("3.12")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_bytes_round_trip(self):
+        def state(team):
+            return (
+                [(type(m), m.get_simple_mode(), m.get_initial_level(), m.get_level(), m.get_hp(), m.get_max_hp()) for m in team],
+                team.clone_team, len(team), team.ascending,
+            )
+
+        for team_mode in (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK, MonsterTeam.TeamMode.OPTIMISE):
+            team = MonsterTeam(
+                team_mode=team_mode,
+                selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+                sort_key=MonsterTeam.SortMode.HP,
+                provided_monsters=ArrayR.from_list([Flamikin, Aquariuma, Rockodile, Vineon]),
+            )
+            monster = team.retrieve_from_team()
+            monster.level_up()
+            monster.set_hp(monster.get_hp() - 3)
+            team.add_to_team(monster)
+            team.special()
+
+            data = team.to_bytes()
+            self.assertLess(len(data), 200)
+            copy = MonsterTeam.from_bytes(data)
+            self.assertEqual(state(copy), state(team))
+            copy.regenerate_team()
+            team.regenerate_team()
+            self.assertEqual(state(copy), state(team))
+
+        self.assertRaises(ValueError, lambda: MonsterTeam.from_bytes(b"MT"))
+        self.assertRaises(ValueError, lambda: MonsterTeam.from_bytes(data[:-1]))
+        # species ids outside the roster: the first member's, then the last snapshot entry's
+        header_size = 24
+        self.assertRaises(ValueError, lambda: MonsterTeam.from_bytes(data[:header_size] + b"\xff\xff" + data[header_size + 2:]))
+        self.assertRaises(ValueError, lambda: MonsterTeam.from_bytes(data[:-9] + b"\xff\xff" + data[-7:]))
+
+    @number("3.13")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_aggregates(self):
+        from elements import Element
+        stats = (
+            (MonsterTeam.SortMode.HP, lambda m: m.get_hp()),
+            (MonsterTeam.SortMode.SPEED, lambda m: m.get_speed()),
+            (MonsterTeam.SortMode.LEVEL, lambda m: m.get_level()),
+        )
+
+        def check(team):
+            monsters = list(team)
+            for sort_mode, stat in stats:
+                self.assertEqual(team.get_total(sort_mode), sum(stat(m) for m in monsters))
+                if monsters:
+                    self.assertEqual(team.get_max(sort_mode), max(stat(m) for m in monsters))
+                    self.assertEqual(stat(team.get_best(sort_mode)), team.get_max(sort_mode))
+                else:
+                    self.assertIsNone(team.get_best(sort_mode))
+            for elem in Element:
+                self.assertEqual(team.get_element_count(elem), sum(m.get_element_type() == elem for m in monsters))
+
+        RandomGen.set_seed(7)
+        for team_mode in (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK, MonsterTeam.TeamMode.OPTIMISE):
+            team = MonsterTeam(
+                team_mode=team_mode,
+                selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+                sort_key=MonsterTeam.SortMode.SPEED,
+                provided_monsters=ArrayR.from_list([Flamikin, Aquariuma, Rockodile, Vineon, Thundrake]),
+            )
+            check(team)
+            for _ in range(50):
+                monster = team.retrieve_from_team()
+                check(team)
+                if RandomGen.random_chance(0.5):
+                    monster.level_up()
+                monster.set_hp(max(1, monster.get_hp() - RandomGen.randint(0, 3)))
+                team.add_to_team(monster)
+                if RandomGen.random_chance(0.3):
+                    team.special()
+                check(team)
+            while len(team):
+                team.retrieve_from_team()
+                check(team)
+            team.regenerate_team()
+            check(team)
+
+    @number("3.14")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_update_monster(self):
+        getters = (
+            (MonsterTeam.SortMode.HP, lambda m: m.get_hp()),
+            (MonsterTeam.SortMode.ATTACK, lambda m: m.get_attack()),
+            (MonsterTeam.SortMode.DEFENSE, lambda m: m.get_defense()),
+            (MonsterTeam.SortMode.SPEED, lambda m: m.get_speed()),
+            (MonsterTeam.SortMode.LEVEL, lambda m: m.get_level()),
+        )
+        RandomGen.set_seed(11)
+        for sort_mode, stat in getters:
+            team = MonsterTeam(
+                team_mode=MonsterTeam.TeamMode.OPTIMISE,
+                selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+                sort_key=sort_mode,
+                provided_monsters=ArrayR.from_list([Flamikin, Aquariuma, Rockodile, Vineon, Thundrake]),
+            )
+            for _ in range(20):
+                monster = team.peek(RandomGen.randint(0, len(team) - 1))
+                for _ in range(RandomGen.randint(0, 2)):
+                    monster.level_up()
+                monster.set_hp(max(1, monster.get_hp() - RandomGen.randint(0, 5)))
+                team.update_monster(monster)
+                if RandomGen.random_chance(0.3):
+                    team.special()
+                lineup = list(team)
+                keys = [stat(m) for m in lineup]
+                self.assertListEqual(keys, sorted(keys, reverse=not team.ascending))
+                self.assertEqual(team.get_total(MonsterTeam.SortMode.HP), sum(m.get_hp() for m in lineup))
+            self.assertRaises(ValueError, lambda: team.update_monster(Flamikin()))
+
+    @number("3.15")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_switch_sort_mode(self):
+        getters = (
+            (MonsterTeam.SortMode.HP, lambda m: m.get_hp()),
+            (MonsterTeam.SortMode.SPEED, lambda m: m.get_speed()),
+            (MonsterTeam.SortMode.ATTACK, lambda m: m.get_attack()),
+        )
+        team = MonsterTeam(
+            team_mode=MonsterTeam.TeamMode.OPTIMISE,
+            selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+            sort_key=MonsterTeam.SortMode.HP,
+            index_keys=(MonsterTeam.SortMode.SPEED,),
+            provided_monsters=ArrayR.from_list([Flamikin, Aquariuma, Rockodile, Vineon, Thundrake]),
+        )
+        self.assertListEqual(team.get_kept_sort_modes().to_list(), [MonsterTeam.SortMode.HP, MonsterTeam.SortMode.SPEED])
+
+        RandomGen.set_seed(5)
+        for step in range(30):
+            sort_mode, stat = getters[step % len(getters)]
+            team.set_sort_mode(sort_mode)
+            self.assertEqual(team.get_sort_mode(), sort_mode)
+            keys = [stat(m) for m in team]
+            self.assertListEqual(keys, sorted(keys, reverse=not team.ascending))
+
+            monster = team.retrieve_from_team()
+            monster.set_hp(max(1, monster.get_hp() - RandomGen.randint(0, 4)))
+            team.add_to_team(monster)
+            if step % 7 == 6:
+                team.special()
+        self.assertEqual(len(team.get_kept_sort_modes()), 3)
+
+        team.regenerate_team()
+        for sort_mode, stat in getters:
+            team.set_sort_mode(sort_mode)
+            keys = [stat(m) for m in team]
+            self.assertListEqual(keys, sorted(keys, reverse=True))
+        self.assertRaises(ValueError, lambda: MonsterTeam(
+            team_mode=MonsterTeam.TeamMode.FRONT,
+            selection_mode=MonsterTeam.SelectionMode.PROVIDED,
+            provided_monsters=ArrayR.from_list([Flamikin]),
+        ).set_sort_mode(MonsterTeam.SortMode.HP))
+
+    @number("3.16")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_scripted_selection(self):
+        import os
+        import tempfile
+
+        team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.SCRIPTED, script="Flamikin, Aquariuma,Vineon")
+        self.assertListEqual([type(m) for m in team], [Flamikin, Aquariuma, Vineon])
+
+        specs = ["FRONT:Flamikin,Aquariuma", "", "# comment", "optimise:hp:Flamikin,Rockodile,Aquariuma"] * 50
+        with mock.patch("builtins.input", side_effect=AssertionError("no input")), mock.patch("sys.stdout", new=StringIO()) as out:
+            teams = MonsterTeam.from_specs(specs)
+        self.assertEqual(out.getvalue(), "")
+        self.assertEqual(len(teams), 100)
+        self.assertListEqual([type(m) for m in teams[0]], [Aquariuma, Flamikin])
+        self.assertEqual(teams[1].get_sort_mode(), MonsterTeam.SortMode.HP)
+        hps = [m.get_hp() for m in teams[1]]
+        self.assertListEqual(hps, sorted(hps, reverse=True))
+        self.assertIsNot(teams[0].peek(), teams[2].peek())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "teams.txt")
+            with open(path, "w") as f:
+                f.write("\n".join(specs[:4]))
+            from_file = MonsterTeam.from_spec_file(path)
+        self.assertListEqual([[type(m) for m in t] for t in from_file], [[type(m) for m in t] for t in teams[:2]])
+
+        for bad in ("FRONT:Flamikin,Nothing", "SIDEWAYS:Flamikin", "OPTIMISE:Flamikin", "FRONT:Infernox", "FRONT:" + ",".join(["Flamikin"] * 7)):
+            self.assertRaises(ValueError, lambda: MonsterTeam.from_specs(["BACK:Flamikin", bad]))
+
+        class ScriptedTeam(MonsterTeam):
+            pass
+        self.assertIsInstance(ScriptedTeam.from_spec("FRONT:Flamikin"), ScriptedTeam)
+        self.assertTrue(all(isinstance(t, ScriptedTeam) for t in ScriptedTeam.from_specs(specs[:4])))
+
+    @number("3.17")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_capacity_beyond_team_limit(self):
+        n = 50
+        names = ["Flamikin", "Aquariuma", "Vineon", "Rockodile"]
+        script = [names[i % len(names)] for i in range(n)]
+        for team_mode in (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK, MonsterTeam.TeamMode.OPTIMISE):
+            team = MonsterTeam(team_mode, MonsterTeam.SelectionMode.SCRIPTED, script=script, sort_key=MonsterTeam.SortMode.HP, capacity=n)
+            self.assertEqual(len(team), n)
+            self.assertTrue(team.is_full())
+            lineup = list(team)
+            team.special()
+            team.special()
+            if team_mode != MonsterTeam.TeamMode.BACK: # twice is the same line up again
+                self.assertListEqual(list(team), lineup)
+            monsters = [team.retrieve_from_team() for _ in range(n)]
+            for monster in monsters:
+                team.add_to_team(monster)
+            self.assertEqual(len(team), n)
+            team.regenerate_team()
+            self.assertListEqual([type(m) for m in team], [type(m) for m in lineup])
+
+        self.assertRaises(ValueError, lambda: MonsterTeam(MonsterTeam.TeamMode.FRONT, MonsterTeam.SelectionMode.SCRIPTED, script=script))
+        small = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.SCRIPTED, script=names)
+        self.assertFalse(small.is_full())
+        self.assertEqual(small.capacity, MonsterTeam.TEAM_LIMIT)
+
+    @number("3.18")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_switch_sort_mode_large_team(self):
+        n = 30
+        names = [species.get_name() for species in get_registry().spawnable]
+        stats = (
+            (MonsterTeam.SortMode.HP, lambda m: m.get_hp()),
+            (MonsterTeam.SortMode.ATTACK, lambda m: m.get_attack()),
+        )
+        for seed in range(60):
+            RandomGen.set_seed(seed)
+            team = MonsterTeam(
+                MonsterTeam.TeamMode.OPTIMISE,
+                MonsterTeam.SelectionMode.SCRIPTED,
+                script=[names[RandomGen.randint(0, len(names) - 1)] for _ in range(n)],
+                sort_key=MonsterTeam.SortMode.SPEED,
+                index_keys=(MonsterTeam.SortMode.HP, MonsterTeam.SortMode.ATTACK),
+                capacity=n,
+            )
+            monsters = [team.retrieve_from_team() for _ in range(n)]
+            for monster in monsters: # spread the HPs so the kept orderings have something to get wrong
+                monster.set_hp(RandomGen.randint(1, 40))
+                team.add_to_team(monster)
+            for _ in range(12): # out of the top of the SPEED heap, so from the middle of the other two
+                team.retrieve_from_team()
+
+            for sort_mode, stat in stats:
+                team.set_sort_mode(sort_mode)
+                keys = [stat(m) for m in team]
+                self.assertListEqual(keys, sorted(keys, reverse=True))
+            retrieved = [stat(team.retrieve_from_team()) for _ in range(len(keys))]
+            self.assertListEqual(retrieved, sorted(keys, reverse=True))
+
+    @number("3.19")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout(10)
+    def test_bytes_round_trip_beyond_16_bits(self):
+        n = 1 << 16 | 1 # more monsters than a 16 bit count can hold
+        team = MonsterTeam(MonsterTeam.TeamMode.BACK, MonsterTeam.SelectionMode.SCRIPTED, script=["Flamikin"] * n, capacity=n)
+        copy = MonsterTeam.from_bytes(team.to_bytes())
+        self.assertEqual(len(copy), n)
+        self.assertEqual(len(copy.clone_team), n)
+        self.assertTrue(copy.is_full())
+
+    @number("3.20")
+    @visibility(visibility.VISIBILITY_SHOW)
+    @timeout()
+    def test_bytes_round_trip_keeps_capacity(self):
+        for team_mode in (MonsterTeam.TeamMode.FRONT, MonsterTeam.TeamMode.BACK, MonsterTeam.TeamMode.OPTIMISE):
+            team = MonsterTeam(team_mode, MonsterTeam.SelectionMode.SCRIPTED, script=["Flamikin"] * 10, sort_key=MonsterTeam.SortMode.HP, capacity=20)
+            copy = MonsterTeam.from_bytes(team.to_bytes())
+            self.assertEqual(copy.capacity, 20)
+            self.assertFalse(copy.is_full())
+            for _ in range(10):
+                copy.add_to_team(Flamikin())
+            self.assertEqual(len(copy), 20)
+            self.assertEqual(len(copy.team), 20)
+            self.assertTrue(copy.is_full())
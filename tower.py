@@ -106,11 +106,9 @@ class BattleTower:
         :complexity: O(n) -> n = length of team inputted
         :team: team you want to check elements of monsters for and add to list of encountered_elements
         """
-        for _ in range(len(team.team)):
-            monster = team.retrieve_from_team() #get monster
-            monster_element = Element.from_string(monster.get_element()) # get element
+        for monster in team: #read-only walk over the team in order, nothing is taken out or put back
+            monster_element = monster.get_element_type() # get element (resolved once per monster class)
             self.encountered_elements.append(monster_element.value)# add monster element to encountered elements array
-            team.add_to_team(monster) #(O(1) as its always a Queue so append is constant add) add monster back to team
 
     def out_of_meta(self) -> ArrayR[Element]:
         pass